@@ -5,6 +5,7 @@ from .transitions import (
     copy_name,
     cut_copy,
     delete,
+    expand,
     filter,
     focus,
     help,
@@ -31,6 +32,7 @@ assert collapse
 assert copy_name
 assert cut_copy
 assert delete
+assert expand
 assert filter
 assert focus
 assert help
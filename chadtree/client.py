@@ -51,6 +51,7 @@ from .registry import autocmd, dequeue_event, enqueue_event, rpc
 from .settings.load import initial as initial_settings
 from .settings.localization import init as init_locale
 from .state.load import initial as initial_state
+from .state.preview import connect
 from .state.types import State
 from .timeit import timeit
 from .transitions.autocmds import setup
@@ -137,17 +138,30 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
             client.register(ff)
 
         focus_ref = RefCell[Optional[PurePath]](None)
+        preview_ref = RefCell[Optional[State]](None)
         event = Event()
-        lock = Lock()
+        lock, redraw_lock = Lock(), Lock()
+
+        def preview(state: State) -> None:
+            if lock.locked() and state.id == state_ref.val.id:
+                preview_ref.val = state
+                event.set()
+
+        connect(preview)
 
         async def step(method: Method, params: Sequence[Any]) -> None:
             if handler := cast(Optional[_CB], handlers.get(method)):
                 with suppress_and_log():
                     async with lock:
-                        if stage := await handler(state_ref.val, *params):
-                            state_ref.val = stage.state
-                            focus_ref.val = stage.focus
-                            event.set()
+                        try:
+                            if stage := await handler(state_ref.val, *params):
+                                state_ref.val = stage.state
+                                focus_ref.val = stage.focus
+                                event.set()
+                        finally:
+                            if preview_ref.val:
+                                preview_ref.val = None
+                                event.set()
             else:
                 assert False, (method, params)
 
@@ -183,20 +197,29 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
             @_die
             async def cont() -> None:
                 nonlocal has_drawn
-                with suppress_and_log():
-                    if state := state_ref.val:
-                        for attempt in range(1, RENDER_RETRIES + 1):
-                            try:
-                                derived = await redraw(state, focus=focus_ref.val)
-                            except NvimError as e:
-                                if attempt == RENDER_RETRIES:
-                                    log.warning("%s", e)
-                            else:
-                                state_ref.val = replace(
-                                    state, node_row_lookup=derived.node_row_lookup
-                                )
-                                focus_ref.val = None
-                                break
+                async with redraw_lock:
+                    with suppress_and_log():
+                        partial = preview_ref.val
+                        if state := partial or state_ref.val:
+                            focus = None if partial else focus_ref.val
+                            for attempt in range(1, RENDER_RETRIES + 1):
+                                try:
+                                    derived = await redraw(state, focus=focus)
+                                except NvimError as e:
+                                    if attempt == RENDER_RETRIES:
+                                        log.warning("%s", e)
+                                else:
+                                    lookup = derived.node_row_lookup
+                                    if partial:
+                                        state_ref.val = replace(
+                                            state_ref.val, node_row_lookup=lookup
+                                        )
+                                    elif state_ref.val is state:
+                                        state_ref.val = replace(
+                                            state, node_row_lookup=lookup
+                                        )
+                                        focus_ref.val = None
+                                    break
 
                         if settings.profiling and not has_drawn:
                             has_drawn = True
@@ -210,7 +233,10 @@ async def _go(loop: AbstractEventLoop, client: RPClient) -> None:
                 finally:
                     event.clear()
 
-        await gather(c1(), c2(), _sched(state_ref))
+        try:
+            await gather(c1(), c2(), _sched(state_ref))
+        finally:
+            state_ref.val.watcher.close()
 
 
 async def init(socket: ServerAddr, ppid: int, th: ThreadPoolExecutor) -> None:
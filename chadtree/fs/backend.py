@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+from os import makedirs, readlink
+from os import remove as rm
+from os import scandir, stat, stat_result, symlink
+from os.path import isdir, normpath
+from pathlib import Path, PurePath
+from shutil import copy2, copytree
+from shutil import move as mv
+from shutil import rmtree
+from stat import S_ISDIR
+from typing import ContextManager, Iterator, Protocol
+
+from std2.stat import RW_R__R__, RWXR_XR_X
+
+_FOLDER_MODE = RWXR_XR_X
+_FILE_MODE = RW_R__R__
+
+
+class Entry(Protocol):
+    """
+    Subset of `os.DirEntry`
+    """
+
+    @property
+    def name(self) -> str: ...
+
+    @property
+    def path(self) -> str: ...
+
+    def inode(self) -> int: ...
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool: ...
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool: ...
+
+    def is_symlink(self) -> bool: ...
+
+    def stat(self, *, follow_symlinks: bool = True) -> stat_result: ...
+
+
+class Backend(Protocol):
+    def scandir(self, path: PurePath) -> ContextManager[Iterator[Entry]]: ...
+
+    def stat(self, path: PurePath, *, follow_symlinks: bool = True) -> stat_result: ...
+
+    def readlink(self, path: PurePath) -> PurePath: ...
+
+    def resolve(self, path: PurePath, *, strict: bool) -> PurePath: ...
+
+    def mkdir(self, path: PurePath) -> None: ...
+
+    def touch(self, path: PurePath) -> None: ...
+
+    def symlink(self, src: PurePath, dst: PurePath) -> None: ...
+
+    def move(self, src: PurePath, dst: PurePath) -> None: ...
+
+    def copy(self, src: PurePath, dst: PurePath) -> None: ...
+
+    def remove(self, path: PurePath) -> None: ...
+
+
+class Local:
+    @contextmanager
+    def scandir(self, path: PurePath) -> Iterator[Iterator[Entry]]:
+        with scandir(path) as it:
+            yield it
+
+    def stat(self, path: PurePath, *, follow_symlinks: bool = True) -> stat_result:
+        return stat(path, follow_symlinks=follow_symlinks)
+
+    def readlink(self, path: PurePath) -> PurePath:
+        return PurePath(readlink(path))
+
+    def resolve(self, path: PurePath, *, strict: bool) -> PurePath:
+        return Path(path).resolve(strict=strict)
+
+    def mkdir(self, path: PurePath) -> None:
+        makedirs(path, mode=_FOLDER_MODE, exist_ok=True)
+
+    def touch(self, path: PurePath) -> None:
+        Path(path).touch(mode=_FILE_MODE, exist_ok=True)
+
+    def symlink(self, src: PurePath, dst: PurePath) -> None:
+        target_is_directory = isdir(src)
+        symlink(normpath(src), normpath(dst), target_is_directory=target_is_directory)
+
+    def move(self, src: PurePath, dst: PurePath) -> None:
+        mv(normpath(src), normpath(dst))
+
+    def copy(self, src: PurePath, dst: PurePath) -> None:
+        info = stat(src, follow_symlinks=False)
+        if S_ISDIR(info.st_mode):
+            copytree(src, dst, symlinks=True, dirs_exist_ok=True)
+        else:
+            copy2(src, dst, follow_symlinks=False)
+
+    def remove(self, path: PurePath) -> None:
+        info = stat(path, follow_symlinks=False)
+        if S_ISDIR(info.st_mode):
+            rmtree(path)
+        else:
+            rm(path)
+
+
+_BACKEND: Backend = Local()
+
+
+def backend() -> Backend:
+    return _BACKEND
@@ -1,14 +1,24 @@
 from __future__ import annotations
 
-from asyncio import sleep
-from concurrent.futures import Executor
-from contextlib import suppress
-from fnmatch import fnmatch
-from os import DirEntry, scandir, stat, stat_result
+from asyncio import FIRST_COMPLETED, Future, gather, get_running_loop, wait
+from concurrent.futures import Executor, ThreadPoolExecutor
+from fnmatch import translate
+from heapq import heappop, heappush, nsmallest
+from itertools import count
+from os import stat_result
 from os.path import normcase
-from pathlib import Path, PurePath
+from pathlib import PurePath
+from queue import SimpleQueue
+from re import compile
 from stat import (
+    S_IFBLK,
+    S_IFCHR,
+    S_IFDIR,
     S_IFDOOR,
+    S_IFIFO,
+    S_IFMT,
+    S_IFREG,
+    S_IFSOCK,
     S_ISBLK,
     S_ISCHR,
     S_ISDIR,
@@ -22,26 +32,58 @@ from stat import (
     S_IWOTH,
     S_IXUSR,
 )
+from threading import Event, Lock
+from time import monotonic
 from typing import (
     AbstractSet,
+    Callable,
+    Iterable,
     Iterator,
+    List,
     Mapping,
     MutableMapping,
+    MutableSet,
     Optional,
+    Pattern,
+    Sequence,
     Tuple,
-    Union,
-    cast,
 )
 
-from std2.itertools import batched
 from std2.pathlib import is_relative_to
 
-from ..consts import BATCH_FACTOR
+from ..consts import IS_WIN
 from ..state.executor import AsyncExecutor
 from ..state.types import Index
 from ..timeit import timeit
+from ..view.sort import needs_stats, sort_key
+from ..view.types import Sortby
+from .backend import Entry, backend
 from .nt import is_junction
-from .types import Ignored, Mode, Node
+from .ops import unify_ancestors
+from .policy import (
+    available,
+    backing_off,
+    deadline,
+    failed,
+    is_flaky,
+    is_pseudo,
+    is_remote,
+    recovered,
+    same_mount,
+    stalled,
+)
+from .types import (
+    EMPTY_CHILDREN,
+    Fingerprint,
+    Ignored,
+    IgnoreMatcher,
+    Listing,
+    Loading,
+    Mode,
+    Node,
+    Stat,
+    mode_mask,
+)
 
 _FILE_MODES: Mapping[int, Mode] = {
     S_IXUSR: Mode.executable,
@@ -52,23 +94,53 @@ _FILE_MODES: Mapping[int, Mode] = {
     S_IWOTH: Mode.other_writable,
     S_IWOTH | S_ISVTX: Mode.sticky_other_writable,
 }
+_FILE_TYPES = (S_IFDIR, S_IFREG, S_IFIFO, S_IFSOCK, S_IFCHR, S_IFBLK, S_IFDOOR)
+_MODE_BITS = frozenset(
+    (
+        Mode.executable,
+        Mode.set_gid,
+        Mode.set_uid,
+        Mode.sticky,
+        Mode.other_writable,
+        Mode.sticky_other_writable,
+        Mode.multi_hardlink,
+    )
+)
+
+_MODE_MASK = S_IFMT(0o177777) | S_ISUID | S_ISGID | S_ISVTX | S_IWOTH | S_IXUSR
+_MULTI_HARDLINK = 0o200000
+_LINK = 0o400000
+
+_LISTINGS: MutableMapping[PurePath, Listing] = {}
+_SCANNED: MutableMapping[PurePath, float] = {}
+
+_STASH: MutableMapping[PurePath, Listing] = {}
+_STASH_LOCK = Lock()
+_STASH_SIZE = 1024
+_PREFETCH_LIMIT = 16
+_PREFETCH_BUDGET = 0.1
 
+_LINKS: MutableMapping[Tuple[int, int, int], Tuple[int, PurePath]] = {}
+_LINKS_LOCK = Lock()
+_LINKS_SIZE = 8192
 
-def _iter(
-    dirent: Union[PurePath, DirEntry[str]], follow: bool, index: Index, lv: int = 0
-) -> Iterator[PurePath]:
-    if not lv:
-        yield PurePath(dirent)
-    with suppress(NotADirectoryError, FileNotFoundError, PermissionError):
-        with scandir(dirent) as dirents:
-            for child in dirents:
-                yield (path := PurePath(child))
-                if child.is_dir(follow_symlinks=follow) and path in index:
-                    yield from _iter(child, follow=follow, index=index, lv=lv + 1)
+_PAINT_AFTER = 0.05
+_PAINT_EVERY = 0.1
+_QUEUED_POLL = 0.05
+_CANCEL_EVERY = 64
 
+_FLAKY_READS = 4
+_FLAKY_POOL = ThreadPoolExecutor(max_workers=_FLAKY_READS)
 
-def _fs_modes(stat: stat_result) -> Iterator[Mode]:
-    st_mode = stat.st_mode
+_REACH_LIMIT = 10000
+_REACH_BUDGET = 2.0
+
+
+class _Cancelled(Exception): ...
+
+
+def _gen_modes(key: int) -> Iterator[Mode]:
+    st_mode = key & _MODE_MASK
     if S_ISDIR(st_mode):
         yield Mode.folder
     if S_ISREG(st_mode):
@@ -81,108 +153,728 @@ def _fs_modes(stat: stat_result) -> Iterator[Mode]:
         yield Mode.char_device
     if S_ISBLK(st_mode):
         yield Mode.block_device
-    if stat.st_nlink > 1:
+    if key & _MULTI_HARDLINK:
         yield Mode.multi_hardlink
+    if key & _LINK:
+        yield Mode.link
     for bit, mode in _FILE_MODES.items():
         if bit and st_mode & bit == bit:
             yield mode
 
 
-def _fs_stat(path: PurePath) -> Tuple[AbstractSet[Mode], Optional[PurePath]]:
+def _gen_keys() -> Iterator[int]:
+    bits = (S_ISUID, S_ISGID, S_ISVTX, S_IWOTH, S_IXUSR)
+    for file_type in _FILE_TYPES:
+        for n in range(1 << len(bits)):
+            perms = sum(bit for idx, bit in enumerate(bits) if n & (1 << idx))
+            for flags in (0, _MULTI_HARDLINK, _LINK, _MULTI_HARDLINK | _LINK):
+                yield file_type | perms | flags
+
+
+_MODES: Mapping[int, int] = {key: mode_mask(_gen_modes(key)) for key in _gen_keys()}
+_ORPHAN = mode_mask((Mode.orphan_link,))
+_FOLDER = _MODES[S_IFDIR]
+_FILE = _MODES[S_IFREG]
+
+
+def _fs_modes(info: stat_result, link: bool) -> int:
+    key = (
+        (info.st_mode & _MODE_MASK)
+        | (_MULTI_HARDLINK if info.st_nlink > 1 else 0)
+        | (_LINK if link else 0)
+    )
+    if (mask := _MODES.get(key)) is not None:
+        return mask
+    else:
+        return mode_mask(_gen_modes(key))
+
+
+def _fs_link(path: PurePath) -> Tuple[int, Optional[PurePath]]:
     try:
-        info = stat(path, follow_symlinks=False)
+        fs = backend()
+        pointed = fs.resolve(path, strict=True)
+        link_info = fs.stat(pointed, follow_symlinks=False)
+    except (OSError, RuntimeError):
+        return _ORPHAN, None
+    else:
+        return _fs_modes(link_info, link=True), pointed
+
+
+def _fs_cached_link(
+    path: PurePath, key: Tuple[int, int, int]
+) -> Tuple[int, Optional[PurePath]]:
+    if cached := _LINKS.get(key):
+        return cached
+    else:
+        mask, pointed = _fs_link(path)
+        if pointed:
+            with _LINKS_LOCK:
+                _LINKS[key] = mask, pointed
+                while len(_LINKS) > _LINKS_SIZE:
+                    _LINKS.pop(next(iter(_LINKS)))
+        return mask, pointed
+
+
+def _fs_stat(path: PurePath, mode_bits: bool) -> Tuple[int, Optional[PurePath]]:
+    try:
+        info = backend().stat(path, follow_symlinks=False)
     except (FileNotFoundError, PermissionError):
-        return {Mode.orphan_link}, None
+        return _ORPHAN, None
     else:
         if S_ISLNK(info.st_mode) or is_junction(info):
-            try:
-                pointed = Path(path).resolve(strict=True)
-                link_info = stat(pointed, follow_symlinks=False)
-            except (FileNotFoundError, NotADirectoryError, RuntimeError):
-                return {Mode.orphan_link}, None
+            return _fs_link(path)
+        elif not mode_bits and S_ISDIR(info.st_mode):
+            return _FOLDER, None
+        elif not mode_bits and S_ISREG(info.st_mode):
+            return _FILE, None
+        else:
+            return _fs_modes(info, link=False), None
+
+
+def _fs_node(path: PurePath, mode_bits: bool) -> Node:
+    mask, pointed = _fs_stat(path, mode_bits=mode_bits)
+    node = Node(path=path, mask=mask, pointed=pointed)
+    return node
+
+
+def _dirent_stat(dirent: Entry) -> Optional[Stat]:
+    try:
+        info = dirent.stat(follow_symlinks=False)
+    except OSError:
+        return None
+    else:
+        return Stat(size=info.st_size, mtime_ns=info.st_mtime_ns)
+
+
+def _fs_entry(dirent: Entry, mode_bits: bool, stats: bool, parent: Fingerprint) -> Node:
+    path = PurePath(dirent.path)
+    pointed: Optional[PurePath] = None
+    try:
+        if dirent.is_symlink():
+            key = (parent.st_dev, dirent.inode(), parent.st_mtime_ns)
+            mask, pointed = _fs_cached_link(path, key=key)
+        elif not mode_bits and not IS_WIN and dirent.is_dir(follow_symlinks=False):
+            mask = _FOLDER
+        elif not mode_bits and not IS_WIN and dirent.is_file(follow_symlinks=False):
+            mask = _FILE
+        else:
+            info = dirent.stat(follow_symlinks=False)
+            if is_junction(info):
+                mask, pointed = _fs_link(path)
             else:
-                mode = {*_fs_modes(link_info)}
-                return mode | {Mode.link}, pointed
+                mask = _fs_modes(info, link=False)
+    except (FileNotFoundError, PermissionError):
+        mask = _ORPHAN
+
+    stat = _dirent_stat(dirent) if stats else None
+    node = Node(path=path, mask=mask, pointed=pointed, stat=stat)
+    return node
+
+
+def needs_mode_bits(modes: Iterable[Optional[Mode]]) -> bool:
+    return not _MODE_BITS.isdisjoint(modes)
+
+
+def _fingerprint(path: PurePath) -> Fingerprint:
+    info = backend().stat(path)
+    return Fingerprint(
+        st_dev=info.st_dev,
+        st_ino=info.st_ino,
+        st_mtime_ns=info.st_mtime_ns,
+        st_ctime_ns=info.st_ctime_ns,
+    )
+
+
+def _entry_is_dir(dirent: Entry) -> bool:
+    try:
+        return dirent.is_dir()
+    except OSError:
+        return False
+
+
+def _scan(
+    path: PurePath,
+    mode_bits: bool,
+    limit: int,
+    sort_by: Sequence[Sortby],
+    cancel: Event,
+) -> Listing:
+    fingerprint = _fingerprint(path)
+    stats = needs_stats(sort_by)
+    with backend().scandir(path) as it:
+        dirents: Sequence[Entry] = tuple(it)
+
+    total = len(dirents)
+    if total > limit:
+        dirents = nsmallest(
+            limit,
+            dirents,
+            key=lambda d: sort_key(
+                sort_by,
+                path=PurePath(d.path),
+                is_dir=_entry_is_dir(d),
+                stat=_dirent_stat(d) if stats else None,
+            ),
+        )
+
+    children: MutableMapping[PurePath, Node] = {}
+    for idx, dirent in enumerate(dirents):
+        if not idx % _CANCEL_EVERY and cancel.is_set():
+            raise _Cancelled()
+        node = _fs_entry(dirent, mode_bits=mode_bits, stats=stats, parent=fingerprint)
+        children[node.path] = node
+
+    return Listing(
+        fingerprint=fingerprint,
+        children=children,
+        total=total,
+        mode_bits=mode_bits,
+        stats=stats,
+    )
+
+
+def _paged(listing: Listing, limit: int) -> bool:
+    return len(listing.children) >= min(limit, listing.total)
+
+
+def _stash(listings: Iterable[Tuple[PurePath, Listing]]) -> None:
+    with _STASH_LOCK:
+        for path, listing in listings:
+            _STASH.pop(path, None)
+            _STASH[path] = listing
+        while len(_STASH) > _STASH_SIZE:
+            _STASH.pop(next(iter(_STASH)))
+
+
+def _unstash(path: PurePath) -> Optional[Listing]:
+    with _STASH_LOCK:
+        return _STASH.pop(path, None)
+
+
+def _held(path: PurePath) -> Optional[Listing]:
+    if listing := _LISTINGS.get(path) or _unstash(path):
+        _LISTINGS[path] = listing
+    return listing
+
+
+def _load(
+    path: PurePath,
+    mode_bits: bool,
+    limit: int,
+    sort_by: Sequence[Sortby],
+    force: bool,
+    validate: bool,
+    cancel: Event,
+) -> Optional[Listing]:
+    if not force and backing_off(path):
+        return _held(path)
+
+    cached = _LISTINGS.get(path)
+    if not cached and (cached := _unstash(path)):
+        validate = True
+
+    if cached and not _paged(cached, limit=limit):
+        force = True
+
+    if cached and (cached.mode_bits, cached.stats) != (mode_bits, needs_stats(sort_by)):
+        force = True
+
+    if cached and not force and (not validate or is_pseudo(path)):
+        return cached
+
+    try:
+        if cached and not force and cached.fingerprint == _fingerprint(path):
+            listing = cached
+        else:
+            started = monotonic()
+            listing = _scan(
+                path,
+                mode_bits=mode_bits,
+                limit=limit,
+                sort_by=sort_by,
+                cancel=cancel,
+            )
+            _SCANNED[path] = started
+    except _Cancelled:
+        return None
+    except NotADirectoryError:
+        _LISTINGS.pop(path, None)
+        _SCANNED.pop(path, None)
+        return None
+    except (FileNotFoundError, PermissionError):
+        _LISTINGS.pop(path, None)
+        _SCANNED.pop(path, None)
+        failed(path)
+        return None
+    except OSError:
+        failed(path)
+        if cached:
+            _LISTINGS[path] = cached
+        return cached
+    else:
+        _LISTINGS[path] = listing
+        recovered(path)
+        return listing
+
+
+def _assemble(
+    node: Node,
+    listings: Mapping[PurePath, Listing],
+    prev: Optional[Node],
+    grafts: Mapping[PurePath, Node],
+    loading: AbstractSet[PurePath],
+) -> Node:
+    prev = prev or grafts.get(node.path)
+    if listing := listings.get(node.path):
+        prev_children = prev.children if prev else EMPTY_CHILDREN
+        children = {
+            path: _assemble(
+                child,
+                listings=listings,
+                prev=prev_children.get(path),
+                grafts=grafts,
+                loading=loading,
+            )
+            for path, child in listing.children.items()
+        }
+        more = listing.total - len(listing.children)
+        if (
+            prev
+            and prev.mask == node.mask
+            and prev.pointed == node.pointed
+            and prev.stat == node.stat
+            and prev.more == more
+            and len(prev_children) == len(children)
+            and all(
+                prev_children.get(path) is child for path, child in children.items()
+            )
+        ):
+            return prev
+        else:
+            return Node(
+                path=node.path,
+                mask=node.mask,
+                pointed=node.pointed,
+                children=children,
+                more=more,
+                stat=node.stat,
+            )
+    elif node.path in loading:
+        if prev and node.path in _LISTINGS:
+            return prev
+        else:
+            return Loading(
+                path=node.path, mask=node.mask, pointed=node.pointed, stat=node.stat
+            )
+    else:
+        return node
+
+
+def _deepest(root: Node, path: PurePath) -> Optional[Node]:
+    if not is_relative_to(path, root.path):
+        return None
+    else:
+        node = root
+        for part in path.relative_to(root.path).parts:
+            if not (child := node.children.get(node.path / part)):
+                break
+            node = child
+        return node
+
+
+def lookup(root: Node, path: PurePath) -> Optional[Node]:
+    node = _deepest(root, path=path)
+    return node if node and node.path == path else None
+
+
+def _graft(root: Node, subtree: Node) -> Node:
+    if root.path == subtree.path:
+        return subtree
+    else:
+        part, *_ = subtree.path.relative_to(root.path).parts
+        path = root.path / part
+        if not (child := root.children.get(path)):
+            return root
         else:
-            mode = {*_fs_modes(info)}
-            return mode, None
+            children = {**root.children, path: _graft(child, subtree=subtree)}
+            return Node(
+                path=root.path,
+                mask=root.mask,
+                pointed=root.pointed,
+                children=children,
+                more=root.more,
+                stat=root.stat,
+            )
+
+
+def _subdirs(node: Node) -> Iterator[PurePath]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if is_dir(node):
+            yield node.path
+            stack.extend(node.children.values())
 
 
-def _fs_node(path: PurePath) -> Node:
-    mode, pointed = _fs_stat(path)
-    node = Node(
-        path=path,
-        mode=mode,
-        pointed=pointed,
-        children={},
+def _evict(paths: Iterable[PurePath], keep: Mapping[PurePath, Listing]) -> None:
+    def cont() -> Iterator[Tuple[PurePath, Listing]]:
+        for path in paths:
+            if path not in keep and (listing := _LISTINGS.pop(path, None)):
+                _SCANNED.pop(path, None)
+                yield path, listing
+
+    _stash(cont())
+
+
+def _pool(th: Executor, path: PurePath) -> Executor:
+    return _FLAKY_POOL if is_flaky(path) else th
+
+
+def _openable(
+    node: Node, follow_links: bool, one_file_system: bool, origin: PurePath
+) -> bool:
+    return act_like_dir(node, follow_links=follow_links) and (
+        not one_file_system or same_mount(node.pointed or node.path, origin)
     )
-    return node
 
 
-def _iter_single_nodes(
-    th: Executor, root: PurePath, follow: bool, index: Index
-) -> Iterator[Node]:
-    with timeit("fs->_iter"):
-        dir_stream = batched(_iter(root, index=index, follow=follow), n=BATCH_FACTOR)
-        for seq in th.map(lambda x: tuple(map(_fs_node, x)), dir_stream):
-            yield from seq
+def _expand(
+    node: Node,
+    follow_links: bool,
+    one_file_system: bool,
+    index: Index,
+    origin: PurePath,
+) -> bool:
+    return node.path in index and _openable(
+        node,
+        follow_links=follow_links,
+        one_file_system=one_file_system,
+        origin=origin,
+    )
+
+
+def _dedupe(
+    listings: Mapping[PurePath, Listing], linked: AbstractSet[PurePath]
+) -> Mapping[PurePath, Listing]:
+    inodes = {
+        path: (listing.fingerprint.st_dev, listing.fingerprint.st_ino)
+        for path, listing in listings.items()
+    }
+    owners: MutableMapping[Tuple[int, int], PurePath] = {}
+    for path in sorted(inodes, key=lambda path: (path in linked, path)):
+        owners.setdefault(inodes[path], path)
+
+    dropped = {path for path in linked if owners[inodes[path]] != path}
+    return {
+        path: listing
+        for path, listing in listings.items()
+        if not dropped.intersection((path, *path.parents))
+    }
+
+
+async def _walk(
+    th: Executor,
+    root: Node,
+    prev: Optional[Node],
+    grafts: Mapping[PurePath, Node],
+    follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
+    index: Index,
+    origin: PurePath,
+    visited: AbstractSet[Tuple[int, int]],
+    invalidate_dirs: AbstractSet[PurePath],
+    validate_dirs: AbstractSet[PurePath],
+    progress: Optional[Callable[[Node], None]],
+) -> Tuple[Node, Mapping[PurePath, Listing]]:
+    loop = get_running_loop()
+    listings: MutableMapping[PurePath, Listing] = {}
+    chains: MutableMapping[PurePath, AbstractSet[Tuple[int, int]]] = {}
+    linked: MutableSet[PurePath] = set()
+    schedule: List[
+        Tuple[float, int, PurePath, Future[Tuple[Node, Optional[Listing]]]]
+    ] = []
+    seq = count()
+    started: SimpleQueue[Tuple[float, PurePath, PurePath]] = SimpleQueue()
+    forked: MutableMapping[Future[Tuple[Node, Optional[Listing]]], Node] = {}
+    futures: MutableMapping[PurePath, Future[Tuple[Node, Optional[Listing]]]] = {}
+    paint_at = monotonic() + _PAINT_AFTER if progress else float("inf")
+    cancel = Event()
 
+    def load(node: Node, budget: float) -> Tuple[Node, Optional[Listing]]:
+        path = node.path
+        started.put((monotonic() + budget, node.pointed or path, path))
+        if cancel.is_set():
+            return node, None
+        elif not available(node.pointed or path):
+            return node, _held(path)
 
-async def _new(th: Executor, root: PurePath, follow_links: bool, index: Index) -> Node:
-    nodes: MutableMapping[PurePath, Node] = {}
+        listing = _load(
+            path,
+            mode_bits=mode_bits,
+            limit=page_size * pages.get(path, 1),
+            sort_by=sort_by,
+            force=path in invalidate_dirs,
+            validate=any(is_relative_to(path, dir) for dir in validate_dirs),
+            cancel=cancel,
+        )
+        return node, listing
+
+    def fork(node: Node) -> Future[Tuple[Node, Optional[Listing]]]:
+        physical = node.pointed or node.path
+        budget = deadline(physical)
+        pool = _pool(th, path=physical)
+        fut = loop.run_in_executor(pool, load, node, budget)
+        if pool is not th:
+            heappush(schedule, (monotonic() + budget, next(seq), physical, fut))
+        forked[fut] = node
+        futures[node.path] = fut
+        return fut
+
+    pending: AbstractSet[Future[Tuple[Node, Optional[Listing]]]] = {fork(root)}
+    drained = 0
+    try:
+        while pending:
+            while not started.empty():
+                due, physical, path = started.get_nowait()
+                heappush(schedule, (due, next(seq), physical, futures[path]))
+                drained += 1
+
+            while schedule and schedule[0][-1] not in pending:
+                heappop(schedule)
+
+            due = schedule[0][0] if schedule else float("inf")
+            if len(forked) > drained:
+                due = min(due, monotonic() + _QUEUED_POLL)
+            done, pending = await wait(
+                pending,
+                timeout=max(0, min(due, paint_at) - monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
 
-    for idx, node in enumerate(
-        _iter_single_nodes(th, root=root, follow=follow_links, index=index), start=1
-    ):
-        if idx % BATCH_FACTOR == 0:
-            await sleep(0)
-        nodes[node.path] = node
-        if parent := nodes.get(node.path.parent):
-            if parent == node:
-                continue
-            cast(MutableMapping[PurePath, Node], parent.children)[node.path] = node
+            now = monotonic()
+            joined = [fut.result() for fut in done]
+            while schedule and schedule[0][0] <= now:
+                _, _, physical, fut = heappop(schedule)
+                if fut in pending:
+                    pending -= {fut}
+                    stalled(physical)
+                    node = forked[fut]
+                    joined.append((node, _held(node.path)))
 
-    return nodes[root]
+            for node, listing in joined:
+                if listing:
+                    fp = listing.fingerprint
+                    inode = fp.st_dev, fp.st_ino
+                    above = chains.get(node.path.parent, visited)
+                    if not (node.pointed and inode in above):
+                        chains[node.path] = {*above, inode}
+                        listings[node.path] = listing
+                        if node.pointed:
+                            linked.add(node.path)
+                        pending |= {
+                            fork(child)
+                            for child in listing.children.values()
+                            if _expand(
+                                child,
+                                follow_links=follow_links,
+                                one_file_system=one_file_system,
+                                index=index,
+                                origin=origin,
+                            )
+                        }
 
+            if progress and pending and (now := monotonic()) >= paint_at:
+                paint_at = now + _PAINT_EVERY
+                partial = _assemble(
+                    root,
+                    listings=listings,
+                    prev=prev,
+                    grafts=grafts,
+                    loading={forked[fut].path for fut in pending},
+                )
+                progress(partial)
+    except BaseException:
+        cancel.set()
+        raise
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+    kept = _dedupe(listings, linked=linked)
+    new_root = _assemble(
+        root, listings=kept, prev=prev, grafts=grafts, loading=frozenset()
+    )
+    return new_root, kept
+
+
+async def _new(
+    th: Executor,
+    root: PurePath,
+    prev: Optional[Node],
+    follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
+    index: Index,
+    progress: Optional[Callable[[Node], None]],
+) -> Node:
+    grafts = {
+        node.path: node
+        for node in (prev, prev and lookup(prev, path=root))
+        if node and node.children
+    }
+    if not (node := grafts.get(root)):
+        loop = get_running_loop()
+        node = await loop.run_in_executor(th, _fs_node, root, mode_bits)
 
-def _cross_over(root: PurePath, invalid: PurePath) -> bool:
-    return is_relative_to(root, invalid) or is_relative_to(invalid, root)
+    new_root, listings = await _walk(
+        th,
+        root=node,
+        prev=None,
+        grafts=grafts,
+        follow_links=follow_links,
+        one_file_system=one_file_system,
+        mode_bits=mode_bits,
+        page_size=page_size,
+        pages=pages,
+        sort_by=sort_by,
+        index=index,
+        origin=node.pointed or node.path,
+        visited=frozenset(),
+        invalidate_dirs=frozenset(),
+        validate_dirs=frozenset(),
+        progress=progress,
+    )
+    _evict(tuple(_LISTINGS), keep=listings)
+    return new_root
 
 
 async def _update(
     th: Executor,
     root: Node,
     follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
     index: Index,
     invalidate_dirs: AbstractSet[PurePath],
+    rewalk_dirs: AbstractSet[PurePath],
+    progress: Optional[Callable[[Node], None]],
 ) -> Node:
-    if any((_cross_over(root.path, invalid=invalid) for invalid in invalidate_dirs)):
-        return await _new(th, root=root.path, follow_links=follow_links, index=index)
+    nearest = {
+        path: prev
+        for path in {*invalidate_dirs, *rewalk_dirs}
+        if (prev := _deepest(root, path=path))
+    }
+    invalidate_dirs = {
+        *invalidate_dirs,
+        *(prev.path for path, prev in nearest.items() if prev.path != path),
+    }
+    if root.path in invalidate_dirs:
+        loop = get_running_loop()
+        node = await loop.run_in_executor(th, _fs_node, root.path, mode_bits)
     else:
-        children: MutableMapping[PurePath, Node] = {}
-        for path, node in root.children.items():
-            new_node = await _update(
+        node = root
+
+    origin = node.pointed or node.path
+    known = {prev.path: prev for prev in nearest.values()}
+    anchors = tuple(known[path] for path in unify_ancestors(known.keys()))
+    partial = root
+
+    def paint(subtree: Node) -> None:
+        nonlocal partial
+        if progress:
+            partial = _graft(partial, subtree=subtree)
+            progress(partial)
+
+    async def rewalk(prev: Node) -> Tuple[Node, Node]:
+        path = prev.path
+        sub = node if path == root.path else prev
+        if path != root.path and not _expand(
+            sub,
+            follow_links=follow_links,
+            one_file_system=one_file_system,
+            index=index,
+            origin=origin,
+        ):
+            if not prev.children:
+                return prev, prev
+            else:
+                _evict(_subdirs(prev), keep={})
+                return prev, Node(
+                    path=sub.path, mask=sub.mask, pointed=sub.pointed, stat=sub.stat
+                )
+        else:
+            visited = {
+                (listing.fingerprint.st_dev, listing.fingerprint.st_ino)
+                for parent in path.parents
+                if (listing := _LISTINGS.get(parent))
+            }
+            subtree, listings = await _walk(
                 th,
-                root=node,
+                root=sub,
+                prev=prev,
+                grafts={},
                 follow_links=follow_links,
+                one_file_system=one_file_system,
+                mode_bits=mode_bits,
+                page_size=page_size,
+                pages=pages,
+                sort_by=sort_by,
                 index=index,
+                origin=origin,
+                visited=visited,
                 invalidate_dirs=invalidate_dirs,
+                validate_dirs=invalidate_dirs,
+                progress=paint if progress else None,
             )
-            children[path] = new_node
-        return Node(
-            path=root.path,
-            mode=root.mode,
-            pointed=root.pointed,
-            children=children,
-        )
+            _evict(_subdirs(prev), keep=listings)
+            return prev, subtree
+
+    new_root = root
+    for prev, subtree in await gather(*map(rewalk, anchors)):
+        if subtree is not prev:
+            new_root = _graft(new_root, subtree=subtree)
+    return new_root
 
 
 async def new(
-    exec: AsyncExecutor, root: PurePath, follow_links: bool, index: Index
+    exec: AsyncExecutor,
+    root: PurePath,
+    *,
+    prev: Optional[Node],
+    follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
+    index: Index,
+    progress: Optional[Callable[[Node], None]] = None,
 ) -> Node:
     with timeit("fs->new"):
         return await exec.submit(
-            _new(exec.threadpool, root=root, follow_links=follow_links, index=index)
+            _new(
+                exec.threadpool,
+                root=root,
+                prev=prev,
+                follow_links=follow_links,
+                one_file_system=one_file_system,
+                mode_bits=mode_bits,
+                page_size=page_size,
+                pages=pages,
+                sort_by=sort_by,
+                index=index,
+                progress=progress,
+            )
         )
 
 
@@ -191,36 +883,281 @@ async def update(
     root: Node,
     *,
     follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
     index: Index,
     invalidate_dirs: AbstractSet[PurePath],
+    rewalk_dirs: AbstractSet[PurePath],
+    progress: Optional[Callable[[Node], None]] = None,
 ) -> Node:
     with timeit("fs->_update"):
-        try:
-            return await exec.submit(
-                _update(
-                    exec.threadpool,
-                    root=root,
-                    follow_links=follow_links,
-                    index=index,
-                    invalidate_dirs=invalidate_dirs,
-                )
+        return await exec.submit(
+            _update(
+                exec.threadpool,
+                root=root,
+                follow_links=follow_links,
+                one_file_system=one_file_system,
+                mode_bits=mode_bits,
+                page_size=page_size,
+                pages=pages,
+                sort_by=sort_by,
+                index=index,
+                invalidate_dirs=invalidate_dirs,
+                rewalk_dirs=rewalk_dirs,
+                progress=progress,
+            )
+        )
+
+
+async def _reach(
+    th: Executor,
+    path: PurePath,
+    depth: Optional[int],
+    follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
+    ignores: Optional[IgnoreMatcher],
+    origin: PurePath,
+) -> Tuple[AbstractSet[PurePath], int]:
+    loop = get_running_loop()
+    deadline = monotonic() + _REACH_BUDGET
+    cancel = Event()
+    reached: MutableSet[PurePath] = set()
+    seen: MutableSet[Tuple[int, int]] = set()
+    levels: MutableMapping[Future[Tuple[Node, Optional[Listing]]], int] = {}
+    entries, cut = 0, False
+
+    def load(node: Node) -> Tuple[Node, Optional[Listing]]:
+        listing = _load(
+            node.path,
+            mode_bits=mode_bits,
+            limit=page_size * pages.get(node.path, 1),
+            sort_by=sort_by,
+            force=False,
+            validate=True,
+            cancel=cancel,
+        )
+        return node, listing
+
+    def fork(node: Node, level: int) -> Future[Tuple[Node, Optional[Listing]]]:
+        fut = loop.run_in_executor(_pool(th, path=node.path), load, node)
+        levels[fut] = level
+        return fut
+
+    root = Node(path=path, mask=_FOLDER, pointed=None)
+    pending: AbstractSet[Future[Tuple[Node, Optional[Listing]]]] = {fork(root, 0)}
+    try:
+        while pending:
+            done, pending = await wait(
+                pending,
+                timeout=max(0, deadline - monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+
+            for fut in done:
+                node, listing = fut.result()
+                level = levels.pop(fut)
+                if listing:
+                    fp = listing.fingerprint
+                    inode = fp.st_dev, fp.st_ino
+                    if not (node.pointed and inode in seen):
+                        seen.add(inode)
+                        reached.add(node.path)
+                        entries += len(listing.children)
+                        if depth is None or level + 1 < depth:
+                            children = tuple(
+                                child
+                                for child in listing.children.values()
+                                if _openable(
+                                    child,
+                                    follow_links=follow_links,
+                                    one_file_system=one_file_system,
+                                    origin=origin,
+                                )
+                                and not (ignores and user_ignored(child, ignores))
+                            )
+                            if entries >= _REACH_LIMIT:
+                                cut |= bool(children)
+                            else:
+                                pending |= {
+                                    fork(child, level + 1) for child in children
+                                }
+    finally:
+        if pending:
+            cut = True
+            cancel.set()
+            for fut in pending:
+                fut.cancel()
+
+    return reached, entries if cut else 0
+
+
+async def reach(
+    exec: AsyncExecutor,
+    path: PurePath,
+    *,
+    depth: Optional[int],
+    follow_links: bool,
+    one_file_system: bool,
+    mode_bits: bool,
+    page_size: int,
+    pages: Mapping[PurePath, int],
+    sort_by: Sequence[Sortby],
+    ignores: Optional[IgnoreMatcher],
+    origin: PurePath,
+) -> Tuple[AbstractSet[PurePath], int]:
+    """
+    Folders under `path` down to `depth`, within a bounded walk
+
+    -> (reached, entries seen if the walk was cut short else 0)
+    """
+
+    with timeit("fs->reach"):
+        return await exec.submit(
+            _reach(
+                exec.threadpool,
+                path=path,
+                depth=depth,
+                follow_links=follow_links,
+                one_file_system=one_file_system,
+                mode_bits=mode_bits,
+                page_size=page_size,
+                pages=pages,
+                sort_by=sort_by,
+                ignores=ignores,
+                origin=origin,
             )
-        except FileNotFoundError:
-            return await new(
-                exec, follow_links=follow_links, root=root.path, index=index
+        )
+
+
+def _prefetch(
+    paths: Sequence[PurePath],
+    mode_bits: bool,
+    page_size: int,
+    sort_by: Sequence[Sortby],
+) -> None:
+    deadline = monotonic() + _PREFETCH_BUDGET
+    for path in paths[:_PREFETCH_LIMIT]:
+        if monotonic() >= deadline:
+            break
+        elif path in _LISTINGS or path in _STASH:
+            continue
+        elif is_pseudo(path) or is_remote(path) or not available(path):
+            continue
+        else:
+            try:
+                listing = _scan(
+                    path,
+                    mode_bits=mode_bits,
+                    limit=page_size,
+                    sort_by=sort_by,
+                    cancel=Event(),
+                )
+            except OSError:
+                pass
+            else:
+                _stash(((path, listing),))
+
+
+async def prefetch(
+    exec: AsyncExecutor,
+    paths: Sequence[PurePath],
+    *,
+    mode_bits: bool,
+    page_size: int,
+    sort_by: Sequence[Sortby],
+) -> None:
+    with timeit("fs->prefetch"):
+        loop = get_running_loop()
+        await loop.run_in_executor(
+            exec.threadpool,
+            lambda: _prefetch(
+                paths, mode_bits=mode_bits, page_size=page_size, sort_by=sort_by
+            ),
+        )
+
+
+def stale(paths: Mapping[PurePath, float]) -> AbstractSet[PurePath]:
+    """
+    `paths` not rescanned since they changed
+    """
+
+    return {path for path, at in paths.items() if _SCANNED.get(path, at - 1) < at}
+
+
+def snapshot(root: Node) -> Mapping[PurePath, Listing]:
+    listings: MutableMapping[PurePath, Listing] = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if is_dir(node) and (listing := _LISTINGS.get(node.path)):
+            listings[node.path] = listing
+            stack.extend(node.children.values())
+    return listings
+
+
+def restore(
+    root: Node,
+    *,
+    follow_links: bool,
+    index: Index,
+    listings: Mapping[PurePath, Listing],
+) -> Node:
+    reachable: MutableMapping[PurePath, Listing] = {}
+    stack = [root.path]
+    while stack:
+        path = stack.pop()
+        if listing := listings.get(path):
+            _LISTINGS.setdefault(path, listing)
+            reachable[path] = listing
+            stack.extend(
+                child.path
+                for child in listing.children.values()
+                if child.path in index
+                and act_like_dir(child, follow_links=follow_links)
             )
+    return _assemble(
+        root, listings=reachable, prev=None, grafts={}, loading=frozenset()
+    )
 
 
-def user_ignored(node: Node, ignores: Ignored) -> bool:
-    return (
-        node.path.name in ignores.name_exact
-        or any(fnmatch(node.path.name, pattern) for pattern in ignores.name_glob)
-        or any(fnmatch(normcase(node.path), pattern) for pattern in ignores.path_glob)
+def _compile_globs(patterns: Sequence[str]) -> Optional[Pattern[str]]:
+    if not patterns:
+        return None
+    else:
+        alts = "|".join(f"(?:{translate(normcase(pattern))})" for pattern in patterns)
+        return compile(alts)
+
+
+def compile_ignored(ignores: Ignored) -> IgnoreMatcher:
+    return IgnoreMatcher(
+        name_exact=frozenset(ignores.name_exact),
+        name_glob=_compile_globs(ignores.name_glob),
+        path_glob=_compile_globs(ignores.path_glob),
     )
 
 
+def user_ignored(node: Node, ignores: IgnoreMatcher) -> bool:
+    if node.ignored is None:
+        name = node.path.name
+        node.ignored = (
+            name in ignores.name_exact
+            or bool(ignores.name_glob and ignores.name_glob.match(normcase(name)))
+            or bool(ignores.path_glob and ignores.path_glob.match(normcase(node.path)))
+        )
+    return node.ignored
+
+
 def is_dir(node: Node) -> bool:
-    return Mode.folder in node.mode
+    return bool(node.mask & _FOLDER)
 
 
 def act_like_dir(node: Node, follow_links: bool) -> bool:
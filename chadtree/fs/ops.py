@@ -3,25 +3,27 @@ from dataclasses import dataclass
 from datetime import datetime
 from functools import lru_cache
 from itertools import chain
-from os import makedirs, readlink
-from os import remove as rm
-from os import stat, symlink
-from os.path import isdir, isfile, normpath
 from pathlib import Path, PurePath
-from shutil import copy2, copytree
-from shutil import move as mv
-from shutil import rmtree
 from shutil import which as _which
-from stat import S_ISDIR, S_ISLNK, filemode
-from typing import AbstractSet, Iterable, Mapping, Optional
+from stat import S_ISDIR, S_ISLNK, S_ISREG, filemode
+from typing import (
+    AbstractSet,
+    Callable,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
 
 from std2.asyncio import Locker, to_thread
-from std2.stat import RW_R__R__, RWXR_XR_X
 
+from .backend import backend
 from .nt import is_junction
 
-_FOLDER_MODE = RWXR_XR_X
-_FILE_MODE = RW_R__R__
+_EXISTS: MutableMapping[
+    bool, Mapping[PurePath, Tuple[Optional[Tuple[int, int, int]], bool]]
+] = {}
 
 
 def ancestors(*paths: PurePath) -> AbstractSet[PurePath]:
@@ -80,20 +82,21 @@ def which(path: PurePath) -> Optional[PurePath]:
 
 async def fs_stat(path: PurePath) -> FSstat:
     def cont() -> FSstat:
-        stats = stat(path, follow_symlinks=False)
+        fs = backend()
+        stats = fs.stat(path, follow_symlinks=False)
         permissions = filemode(stats.st_mode)
         user = _get_username(stats.st_uid)
         group = _get_groupname(stats.st_gid)
         date_mod = datetime.fromtimestamp(stats.st_mtime)
         size = stats.st_size
         try:
-            link = (
-                readlink(path) if S_ISLNK(stats.st_mode) or is_junction(stats) else None
+            plink = (
+                fs.readlink(path)
+                if S_ISLNK(stats.st_mode) or is_junction(stats)
+                else None
             )
         except OSError:
             plink = None
-        else:
-            plink = PurePath(link) if link else None
         fs_stat = FSstat(
             permissions=permissions,
             user=user,
@@ -109,7 +112,7 @@ async def fs_stat(path: PurePath) -> FSstat:
 
 async def resolve(path: PurePath, strict: bool) -> Path:
     def cont() -> Path:
-        return Path(path).resolve(strict=strict)
+        return Path(backend().resolve(path, strict=strict))
 
     return await to_thread(cont)
 
@@ -117,7 +120,7 @@ async def resolve(path: PurePath, strict: bool) -> Path:
 async def exists(path: PurePath, follow: bool) -> bool:
     def cont() -> bool:
         try:
-            stat(path, follow_symlinks=follow)
+            backend().stat(path, follow_symlinks=follow)
         except (OSError, ValueError):
             return False
         else:
@@ -126,23 +129,66 @@ async def exists(path: PurePath, follow: bool) -> bool:
     return await to_thread(cont)
 
 
+def _exists_many(paths: Iterable[PurePath], follow: bool) -> Mapping[PurePath, bool]:
+    fs = backend()
+    memo = _EXISTS.get(follow, {})
+    parents: MutableMapping[PurePath, Optional[Tuple[int, int, int]]] = {}
+    acc: MutableMapping[PurePath, Tuple[Optional[Tuple[int, int, int]], bool]] = {}
+
+    for path in paths:
+        if (parent := path.parent) not in parents:
+            try:
+                info = fs.stat(parent)
+            except (OSError, ValueError):
+                parents[parent] = None
+            else:
+                parents[parent] = info.st_dev, info.st_ino, info.st_mtime_ns
+
+        fingerprint = parents[parent]
+        if fingerprint and (cached := memo.get(path)) and cached[0] == fingerprint:
+            acc[path] = cached
+        else:
+            try:
+                info = fs.stat(path, follow_symlinks=False)
+                if follow and S_ISLNK(info.st_mode):
+                    fs.stat(path)
+                    fingerprint = None
+            except (OSError, ValueError):
+                acc[path] = fingerprint, False
+            else:
+                acc[path] = fingerprint, True
+
+    _EXISTS[follow] = acc
+    return {path: exi for path, (_, exi) in acc.items()}
+
+
 async def exists_many(
     paths: Iterable[PurePath], follow: bool
 ) -> Mapping[PurePath, bool]:
-    existence = await gather(*(exists(path, follow=follow) for path in paths))
-    return {path: exi for path, exi in zip(paths, existence)}
+    """
+    Memoised until the parent folder changes, except for symlinks
+    """
+
+    return await to_thread(lambda: _exists_many(paths, follow=follow))
+
+
+def _is(path: PurePath, pred: Callable[[int], bool]) -> bool:
+    try:
+        return pred(backend().stat(path).st_mode)
+    except (OSError, ValueError):
+        return False
 
 
 async def is_dir(path: PurePath) -> bool:
-    return await to_thread(lambda: isdir(path))
+    return await to_thread(lambda: _is(path, pred=S_ISDIR))
 
 
 async def is_file(path: PurePath) -> bool:
-    return await to_thread(lambda: isfile(path))
+    return await to_thread(lambda: _is(path, pred=S_ISREG))
 
 
 def _mkdir_p(path: PurePath) -> None:
-    makedirs(path, mode=_FOLDER_MODE, exist_ok=True)
+    backend().mkdir(path)
 
 
 async def _mkdir(path: PurePath) -> None:
@@ -158,8 +204,8 @@ async def mkdir(paths: Iterable[PurePath]) -> None:
 
 async def _new(path: PurePath) -> None:
     def cont() -> None:
-        makedirs(path.parent, mode=_FOLDER_MODE, exist_ok=True)
-        Path(path).touch(mode=_FILE_MODE, exist_ok=True)
+        _mkdir_p(path.parent)
+        backend().touch(path)
 
     await to_thread(cont)
 
@@ -171,8 +217,8 @@ async def new(paths: Iterable[PurePath]) -> None:
 
 async def _rename(src: PurePath, dst: PurePath) -> None:
     def cont() -> None:
-        makedirs(dst.parent, mode=_FOLDER_MODE, exist_ok=True)
-        mv(normpath(src), normpath(dst))
+        _mkdir_p(dst.parent)
+        backend().move(src, dst)
 
     await to_thread(cont)
 
@@ -184,11 +230,7 @@ async def rename(operations: Mapping[PurePath, PurePath]) -> None:
 
 async def _remove(path: PurePath) -> None:
     def cont() -> None:
-        stats = stat(path, follow_symlinks=False)
-        if S_ISDIR(stats.st_mode):
-            rmtree(path)
-        else:
-            rm(path)
+        backend().remove(path)
 
     await to_thread(cont)
 
@@ -200,7 +242,7 @@ async def remove(paths: Iterable[PurePath]) -> None:
 
 async def _cut(src: PurePath, dst: PurePath) -> None:
     def cont() -> None:
-        mv(normpath(src), normpath(dst))
+        backend().move(src, dst)
 
     await to_thread(cont)
 
@@ -212,11 +254,7 @@ async def cut(operations: Mapping[PurePath, PurePath]) -> None:
 
 async def _copy(src: PurePath, dst: PurePath) -> None:
     def cont() -> None:
-        stats = stat(src, follow_symlinks=False)
-        if S_ISDIR(stats.st_mode):
-            copytree(src, dst, symlinks=True, dirs_exist_ok=True)
-        else:
-            copy2(src, dst, follow_symlinks=False)
+        backend().copy(src, dst)
 
     await to_thread(cont)
 
@@ -228,9 +266,8 @@ async def copy(operations: Mapping[PurePath, PurePath]) -> None:
 
 async def _link(src: PurePath, dst: PurePath) -> None:
     def cont() -> None:
-        target_is_directory = isdir(src)
         _mkdir_p(dst.parent)
-        symlink(normpath(src), normpath(dst), target_is_directory=target_is_directory)
+        backend().symlink(src, dst)
 
     await to_thread(cont)
 
@@ -0,0 +1,187 @@
+import sys
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from re import compile
+from time import monotonic
+from typing import Mapping, Match, MutableMapping, Optional
+
+from pynvim_pp.logging import log
+
+_MOUNTS = Path("/proc/self/mounts")
+_MOUNTS_TTL = 10.0
+_ESCAPED = compile(r"\\([0-7]{3})")
+
+_PSEUDO_FS = frozenset(
+    (
+        "autofs",
+        "binfmt_misc",
+        "bpf",
+        "cgroup",
+        "cgroup2",
+        "configfs",
+        "debugfs",
+        "devpts",
+        "efivarfs",
+        "fusectl",
+        "hugetlbfs",
+        "mqueue",
+        "nsfs",
+        "proc",
+        "pstore",
+        "rpc_pipefs",
+        "securityfs",
+        "sysfs",
+        "tracefs",
+    )
+)
+_REMOTE_FS = frozenset(
+    (
+        "9p",
+        "afs",
+        "ceph",
+        "cifs",
+        "davfs",
+        "fuse.rclone",
+        "fuse.s3fs",
+        "fuse.sshfs",
+        "glusterfs",
+        "ncpfs",
+        "nfs",
+        "nfs4",
+        "smb3",
+        "smbfs",
+        "sshfs",
+    )
+)
+
+_LOCAL_DEADLINE = 5.0
+_REMOTE_DEADLINE = 1.0
+_BACKOFF_BASE = 1.0
+_BACKOFF_MAX = 60.0
+
+
+@dataclass(frozen=True)
+class Mount:
+    point: PurePath
+    fs_type: str
+
+
+@dataclass(frozen=True)
+class _Backoff:
+    count: int
+    retry_at: float
+
+
+@dataclass(frozen=True)
+class _Table:
+    mounts: Mapping[PurePath, Mount]
+    expires_at: float
+
+
+_TABLE = _Table(mounts={}, expires_at=0)
+_FAILED: MutableMapping[PurePath, _Backoff] = {}
+_STALLED: MutableMapping[PurePath, _Backoff] = {}
+
+
+def _unescape(field: str) -> str:
+    def repl(match: Match[str]) -> str:
+        return chr(int(match.group(1), 8))
+
+    return _ESCAPED.sub(repl, field)
+
+
+def _read_mounts() -> Mapping[PurePath, Mount]:
+    if sys.platform != "linux":
+        return {}
+    else:
+        try:
+            lines = _MOUNTS.read_text("UTF-8", errors="surrogateescape").splitlines()
+        except OSError:
+            return {}
+        else:
+            mounts: MutableMapping[PurePath, Mount] = {}
+            for line in lines:
+                _, point, fs_type, *_ = line.split()
+                path = PurePath(_unescape(point))
+                mounts[path] = Mount(point=path, fs_type=fs_type)
+            return mounts
+
+
+def _mounts() -> Mapping[PurePath, Mount]:
+    global _TABLE
+
+    now = monotonic()
+    if _TABLE.expires_at <= now:
+        _TABLE = _Table(mounts=_read_mounts(), expires_at=now + _MOUNTS_TTL)
+    return _TABLE.mounts
+
+
+def mount_of(path: PurePath) -> Optional[Mount]:
+    mounts = _mounts()
+    for parent in (path, *path.parents):
+        if mount := mounts.get(parent):
+            return mount
+    else:
+        return None
+
+
+def same_mount(lhs: PurePath, rhs: PurePath) -> bool:
+    return mount_of(lhs) == mount_of(rhs)
+
+
+def is_pseudo(path: PurePath) -> bool:
+    mount = mount_of(path)
+    return bool(mount and mount.fs_type in _PSEUDO_FS)
+
+
+def is_remote(path: PurePath) -> bool:
+    mount = mount_of(path)
+    return bool(mount and mount.fs_type in _REMOTE_FS)
+
+
+def is_flaky(path: PurePath) -> bool:
+    return is_remote(path) or _stall_key(path) in _STALLED
+
+
+def deadline(path: PurePath) -> float:
+    return _REMOTE_DEADLINE if is_remote(path) else _LOCAL_DEADLINE
+
+
+def _backoff(prev: Optional[_Backoff]) -> _Backoff:
+    count = prev.count + 1 if prev else 1
+    delay = min(_BACKOFF_BASE * 2 ** (count - 1), _BACKOFF_MAX)
+    return _Backoff(count=count, retry_at=monotonic() + delay)
+
+
+def _backing_off(backoffs: Mapping[PurePath, _Backoff], key: PurePath) -> bool:
+    backoff = backoffs.get(key)
+    return bool(backoff and backoff.retry_at > monotonic())
+
+
+def failed(path: PurePath) -> None:
+    _FAILED[path] = _backoff(_FAILED.get(path))
+
+
+def recovered(path: PurePath) -> None:
+    _FAILED.pop(path, None)
+    if _STALLED:
+        _STALLED.pop(_stall_key(path), None)
+
+
+def backing_off(path: PurePath) -> bool:
+    return _backing_off(_FAILED, key=path)
+
+
+def _stall_key(path: PurePath) -> PurePath:
+    mount = mount_of(path)
+    return mount.point if mount and mount.fs_type in _REMOTE_FS else path
+
+
+def stalled(path: PurePath) -> None:
+    key = _stall_key(path)
+    _STALLED[key] = _backoff(_STALLED.get(key))
+    log.warning("%s -- %s", key, "unavailable")
+
+
+def available(path: PurePath) -> bool:
+    return not _backing_off(_STALLED, key=_stall_key(path))
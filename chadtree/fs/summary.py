@@ -0,0 +1,138 @@
+from asyncio import get_running_loop
+from dataclasses import dataclass
+from pathlib import PurePath
+from threading import Lock
+from time import monotonic
+from typing import Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+from ..state.executor import AsyncExecutor
+from ..timeit import timeit
+from .backend import backend
+from .cartographer import is_dir
+from .types import Fingerprint, Node, Summary
+
+_BUDGET = 0.05
+
+
+@dataclass(frozen=True)
+class _Entry:
+    fingerprint: Fingerprint
+    epoch: int
+    own: Summary
+    subdirs: Sequence[PurePath]
+
+
+@dataclass(frozen=True)
+class _Job:
+    root: PurePath
+    epoch: int
+    stack: List[Tuple[PurePath, bool]]
+
+
+_LOCK = Lock()
+_ENTRIES: MutableMapping[PurePath, _Entry] = {}
+_TOTALS: MutableMapping[PurePath, Summary] = {}
+_JOB = _Job(root=PurePath(), epoch=0, stack=[])
+
+
+def _drop(path: PurePath) -> None:
+    stack = [path]
+    while stack:
+        path = stack.pop()
+        _TOTALS.pop(path, None)
+        if entry := _ENTRIES.pop(path, None):
+            stack.extend(entry.subdirs)
+
+
+def _entry(path: PurePath, epoch: int) -> Optional[_Entry]:
+    fs = backend()
+    try:
+        info = fs.stat(path)
+        fingerprint = Fingerprint(
+            st_dev=info.st_dev,
+            st_ino=info.st_ino,
+            st_mtime_ns=info.st_mtime_ns,
+            st_ctime_ns=info.st_ctime_ns,
+        )
+        prev = _ENTRIES.get(path)
+        if prev and prev.fingerprint == fingerprint and prev.epoch == epoch:
+            return prev
+
+        size, files, subdirs = 0, 0, []
+        with fs.scandir(path) as it:
+            for dirent in it:
+                try:
+                    st = dirent.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if dirent.is_dir(follow_symlinks=False):
+                    if st.st_dev == info.st_dev:
+                        subdirs.append(PurePath(dirent.path))
+                else:
+                    size += st.st_size
+                    files += 1
+    except OSError:
+        _drop(path)
+        return None
+    else:
+        if prev:
+            for gone in {*prev.subdirs} - {*subdirs}:
+                _drop(gone)
+        entry = _Entry(
+            fingerprint=fingerprint,
+            epoch=epoch,
+            own=Summary(size=size, files=files),
+            subdirs=subdirs,
+        )
+        _ENTRIES[path] = entry
+        return entry
+
+
+def _step(root: PurePath, budget: float) -> None:
+    global _JOB
+
+    deadline = monotonic() + budget
+    if not _JOB.stack:
+        _JOB = _Job(root=root, epoch=_JOB.epoch + 1, stack=[(root, False)])
+    elif _JOB.root != root:
+        _JOB = _Job(root=root, epoch=_JOB.epoch, stack=[(root, False)])
+
+    stack = _JOB.stack
+    while stack and monotonic() < deadline:
+        path, visited = stack.pop()
+        if not visited:
+            if entry := _entry(path, epoch=_JOB.epoch):
+                stack.append((path, True))
+                stack.extend((subdir, False) for subdir in entry.subdirs)
+        elif entry := _ENTRIES.get(path):
+            size, files = entry.own.size, entry.own.files
+            for subdir in entry.subdirs:
+                if total := _TOTALS.get(subdir):
+                    size += total.size
+                    files += total.files
+            _TOTALS[path] = Summary(size=size, files=files)
+
+
+def _dirs(node: Node) -> Iterator[PurePath]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if is_dir(node):
+            yield node.path
+            stack.extend(node.children.values())
+
+
+def _summarize(root: Node) -> Mapping[PurePath, Summary]:
+    with _LOCK:
+        _step(root.path, budget=_BUDGET)
+        return {path: total for path in _dirs(root) if (total := _TOTALS.get(path))}
+
+
+async def summarize(exec: AsyncExecutor, root: Node) -> Mapping[PurePath, Summary]:
+    """
+    Recursive size & file count of open folders, a slice of work per call
+    """
+
+    with timeit("fs->summarize"):
+        loop = get_running_loop()
+        return await loop.run_in_executor(exec.threadpool, _summarize, root)
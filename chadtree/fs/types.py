@@ -1,9 +1,20 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import IntEnum, auto, unique
+from functools import lru_cache
 from pathlib import PurePath
-from typing import AbstractSet, Any, Mapping, Optional, Sequence
+from types import MappingProxyType
+from typing import (
+    AbstractSet,
+    Any,
+    Iterable,
+    Mapping,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
 
 
 # https://github.com/coreutils/coreutils/blob/master/src/ls.c
@@ -31,18 +42,103 @@ class Mode(IntEnum):
     file = auto()
 
 
-@dataclass
-class _RenderCache:
-    sort_by: Optional[Sequence[Any]] = None
+def mode_mask(modes: Iterable[Mode]) -> int:
+    mask = 0
+    for mode in modes:
+        mask |= 1 << mode
+    return mask
+
+
+@lru_cache(maxsize=None)
+def _mode_set(mask: int) -> AbstractSet[Mode]:
+    return frozenset(mode for mode in Mode if mask & (1 << mode))
 
 
 @dataclass(frozen=True)
+class Stat:
+    size: int
+    mtime_ns: int
+
+
 class Node:
-    mode: AbstractSet[Mode]
-    path: PurePath
-    pointed: Optional[PurePath]
+    __slots__ = (
+        "path",
+        "pointed",
+        "children",
+        "mask",
+        "more",
+        "stat",
+        "ignored",
+        "row",
+    )
+
+    def __init__(
+        self,
+        *,
+        path: PurePath,
+        mask: int,
+        pointed: Optional[PurePath],
+        children: Optional[Mapping[PurePath, Node]] = None,
+        more: int = 0,
+        stat: Optional[Stat] = None,
+    ) -> None:
+        self.path = path
+        self.mask = mask
+        self.pointed = pointed
+        self.children = children or EMPTY_CHILDREN
+        self.more = more
+        self.stat = stat
+        self.ignored: Optional[bool] = None
+        self.row: Optional[Tuple[Any, ...]] = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r})"
+
+    @property
+    def mode(self) -> AbstractSet[Mode]:
+        return _mode_set(self.mask)
+
+
+class Pager(Node):
+    """
+    Stand in for the unlisted `more` children of `path`
+    """
+
+    __slots__ = ()
+
+
+class Loading(Node):
+    """
+    Folder whose listing is still in flight
+    """
+
+    __slots__ = ()
+
+
+EMPTY_CHILDREN: Mapping[PurePath, Node] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    st_dev: int
+    st_ino: int
+    st_mtime_ns: int
+    st_ctime_ns: int
+
+
+@dataclass(frozen=True)
+class Listing:
+    fingerprint: Fingerprint
     children: Mapping[PurePath, Node]
-    cache: _RenderCache = field(default_factory=_RenderCache)
+    total: int
+    mode_bits: bool
+    stats: bool
+
+
+@dataclass(frozen=True)
+class Summary:
+    size: int
+    files: int
 
 
 @dataclass(frozen=True)
@@ -50,3 +146,10 @@ class Ignored:
     name_exact: AbstractSet[str]
     name_glob: Sequence[str]
     path_glob: Sequence[str]
+
+
+@dataclass(frozen=True)
+class IgnoreMatcher:
+    name_exact: AbstractSet[str]
+    name_glob: Optional[Pattern[str]]
+    path_glob: Optional[Pattern[str]]
@@ -0,0 +1,168 @@
+import sys
+from contextlib import suppress
+from ctypes import CDLL, c_char_p, c_int, c_uint32, get_errno
+from ctypes.util import find_library
+from errno import EAGAIN, ENOMEM, ENOSPC, EWOULDBLOCK
+from os import close, fsencode, read, strerror
+from pathlib import PurePath
+from struct import Struct
+from time import monotonic
+from typing import AbstractSet, Mapping, MutableMapping, Optional
+
+from pynvim_pp.logging import log
+from std2.pathlib import is_relative_to
+
+# https://man7.org/linux/man-pages/man7/inotify.7.html
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_EXCL_UNLINK = 0x04000000
+
+_IN_NONBLOCK = 0o00004000
+_IN_CLOEXEC = 0o02000000
+
+_MASK = (
+    _IN_ATTRIB
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+    | _IN_EXCL_UNLINK
+)
+_SELF = _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ATTRIB
+
+_EVENT = Struct("iIII")
+_BUF_SIZE = 64 * 1024
+
+
+def _load() -> Optional[CDLL]:
+    if sys.platform != "linux":
+        return None
+    else:
+        try:
+            libc = CDLL(find_library("c"), use_errno=True)
+            libc.inotify_init1.argtypes = (c_int,)
+            libc.inotify_init1.restype = c_int
+            libc.inotify_add_watch.argtypes = (c_int, c_char_p, c_uint32)
+            libc.inotify_add_watch.restype = c_int
+            libc.inotify_rm_watch.argtypes = (c_int, c_int)
+            libc.inotify_rm_watch.restype = c_int
+        except (OSError, AttributeError):
+            return None
+        else:
+            return libc
+
+
+_LIBC = _load()
+
+
+class Watcher:
+    """
+    `drain` -> `None` means fallback to polling, else when each path last changed
+    `writes` -> files being written also dirty their folder
+    """
+
+    def __init__(self, writes: bool = False) -> None:
+        self._mask = _MASK | _IN_CLOSE_WRITE if writes else _MASK
+        self._fd: Optional[int] = None
+        self._wds: MutableMapping[int, PurePath] = {}
+        self._paths: MutableMapping[PurePath, int] = {}
+        self._dirty: MutableMapping[PurePath, float] = {}
+        self._overflow = False
+
+        if _LIBC:
+            fd = _LIBC.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            else:
+                log.warning("%s", strerror(get_errno()))
+
+    @property
+    def active(self) -> bool:
+        return self._fd is not None
+
+    @property
+    def watched(self) -> AbstractSet[PurePath]:
+        return self._paths.keys()
+
+    def close(self) -> None:
+        if (fd := self._fd) is not None:
+            self._fd = None
+            with suppress(OSError):
+                close(fd)
+        self._wds.clear()
+        self._paths.clear()
+        self._dirty.clear()
+
+    def watch(self, root: PurePath, index: AbstractSet[PurePath]) -> None:
+        if (fd := self._fd) is None or not _LIBC:
+            return
+
+        paths = {path for path in index if is_relative_to(path, root)}
+
+        for path in self._paths.keys() - paths:
+            wd = self._paths.pop(path)
+            self._wds.pop(wd, None)
+            _LIBC.inotify_rm_watch(fd, wd)
+
+        for path in paths - self._paths.keys():
+            wd = _LIBC.inotify_add_watch(fd, fsencode(path), self._mask)
+            if wd >= 0:
+                self._paths[path] = wd
+                self._wds[wd] = path
+            elif (errno := get_errno()) in {ENOSPC, ENOMEM}:
+                log.warning("%s -- %s", strerror(errno), "polling fallback")
+                self.close()
+                return
+
+    def mark(self, paths: Mapping[PurePath, float]) -> None:
+        if self.active:
+            for path, at in paths.items():
+                self._dirty[path] = max(at, self._dirty.get(path, at))
+
+    def _read(self, fd: int) -> None:
+        while True:
+            try:
+                buf = read(fd, _BUF_SIZE)
+            except OSError as e:
+                if e.errno not in {EAGAIN, EWOULDBLOCK}:
+                    log.warning("%s -- %s", e, "polling fallback")
+                    self.close()
+                return
+            else:
+                now, offset = monotonic(), 0
+                while offset < len(buf):
+                    wd, mask, _, length = _EVENT.unpack_from(buf, offset)
+                    offset += _EVENT.size + length
+
+                    if mask & _IN_Q_OVERFLOW:
+                        self._overflow = True
+                    elif path := self._wds.get(wd):
+                        self._dirty[path] = now
+                        if not length and mask & _SELF:
+                            self._dirty[path.parent] = now
+                        if mask & _IN_IGNORED:
+                            self._wds.pop(wd, None)
+                            self._paths.pop(path, None)
+
+    def drain(self) -> Optional[Mapping[PurePath, float]]:
+        if (fd := self._fd) is None:
+            return None
+        else:
+            self._read(fd)
+            if not self.active:
+                return None
+            dirty, overflow = self._dirty, self._overflow
+            self._dirty, self._overflow = {}, False
+            return None if overflow else dirty
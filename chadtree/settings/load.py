@@ -34,6 +34,7 @@ from chad_types import (
 )
 
 from ..consts import CONFIG_YML, SETTINGS_VAR
+from ..fs.cartographer import compile_ignored, needs_mode_bits
 from ..fs.types import Ignored
 from ..registry import NAMESPACE
 from ..view.load import load_theme
@@ -49,12 +50,17 @@ class _OpenDirection(Enum):
 @dataclass(frozen=True)
 class _UserOptions:
     close_on_open: bool
+    folder_summary: bool
     follow: bool
     follow_links: bool
     follow_ignore: bool
     lang: Optional[str]
+    max_nodes: int
+    max_open_folders: int
     mimetypes: MimetypeOptions
+    one_file_system: bool
     page_increment: int
+    page_size: int
     polling_rate: SupportsFloat
     session: bool
     show_hidden: bool
@@ -115,7 +121,7 @@ async def initial(specs: Iterable[RPCallable]) -> Settings:
     win_opts = cast(Sequence[Union[bool, str]], await atomic.commit(NoneType))
     win_actual_opts = {k: v for k, v in zip(view.window_options, win_opts)}
 
-    icons, hl_context = load_theme(
+    icons, hl_context, resolver = load_theme(
         artifact=artifacts,
         particular_mappings=theme.highlights,
         discrete_colours=theme.discrete_colour_map,
@@ -132,6 +138,7 @@ async def initial(specs: Iterable[RPCallable]) -> Settings:
     view_opts = ViewOptions(
         hl_context=hl_context,
         icons=icons,
+        resolver=resolver,
         sort_by=tuple(view.sort_by),
         use_icons=use_icons,
         time_fmt=view.time_format,
@@ -152,17 +159,25 @@ async def initial(specs: Iterable[RPCallable]) -> Settings:
     else:
         settings = Settings(
             close_on_open=options.close_on_open,
+            folder_summary=options.folder_summary,
             follow=options.follow,
             follow_links=options.follow_links,
             follow_ignore=options.follow_ignore,
-            ignores=config.ignore,
+            ignores=compile_ignored(config.ignore),
             idle_timeout=float(config.idle_timeout),
             keymap=keymap,
             lang=options.lang,
+            max_nodes=max(1, options.max_nodes),
+            max_open_folders=max(1, options.max_open_folders),
             mime=options.mimetypes,
+            mode_bits=needs_mode_bits(
+                (*hl_context.mode_pre.keys(), *hl_context.mode_post.keys())
+            ),
             min_diagnostics_severity=options.min_diagnostics_severity,
+            one_file_system=options.one_file_system,
             open_left=view.open_direction is _OpenDirection.left,
             page_increment=options.page_increment,
+            page_size=max(1, options.page_size),
             polling_rate=float(options.polling_rate),
             session=options.session,
             show_hidden=options.show_hidden,
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import AbstractSet, Mapping, Optional, Union
 
-from ..fs.types import Ignored
+from ..fs.types import IgnoreMatcher
 from ..view.types import ViewOptions
 
 
@@ -19,15 +19,21 @@ class MimetypeOptions:
 @dataclass(frozen=True)
 class Settings:
     close_on_open: bool
+    folder_summary: bool
     follow: bool
     follow_links: bool
     follow_ignore: bool
-    ignores: Ignored
+    ignores: IgnoreMatcher
     keymap: Mapping[str, AbstractSet[str]]
     lang: Optional[str]
+    max_nodes: int
+    max_open_folders: int
     mime: MimetypeOptions
+    mode_bits: bool
+    one_file_system: bool
     open_left: bool
     page_increment: int
+    page_size: int
     polling_rate: float
     idle_timeout: float
     profiling: bool
@@ -1,17 +1,20 @@
 from asyncio import gather
 from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from time import monotonic
 from uuid import uuid4
 
 from pynvim_pp.nvim import Nvim
 
 from ..consts import SESSION_DIR
-from ..fs.cartographer import new
+from ..fs.cartographer import new, restore
+from ..fs.watch import Watcher
 from ..nvim.markers import markers
 from ..settings.types import Settings
 from ..version_ctl.types import VCStatus
+from ..view.sort import needs_stats
 from .executor import AsyncExecutor
-from .ops import load_session
+from .ops import load_session, load_snapshot
 from .types import Selection, Session, State
 
 
@@ -26,6 +29,9 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
 
     session = Session(workdir=cwd, storage=storage)
     stored = await load_session(session) if settings.session else None
+    snapshot = (
+        await load_snapshot(session, settings=settings) if settings.session else None
+    )
     index = {cwd} | (stored.index if stored else frozenset())
 
     show_hidden = (
@@ -40,10 +46,31 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
     )
 
     selection: Selection = frozenset()
-    node = await new(
-        executor, follow_links=settings.follow_links, root=cwd, index=index
-    )
-    vc = VCStatus()
+    watcher = Watcher(writes=needs_stats(settings.view.sort_by))
+    watcher.watch(cwd, index=index)
+    if snapshot:
+        node = restore(
+            snapshot.root,
+            follow_links=settings.follow_links,
+            index=index,
+            listings=snapshot.listings,
+        )
+        vc = snapshot.vc if enable_vc else VCStatus()
+        watcher.mark({cwd: monotonic()})
+    else:
+        node = await new(
+            executor,
+            root=cwd,
+            prev=None,
+            follow_links=settings.follow_links,
+            one_file_system=settings.one_file_system,
+            mode_bits=settings.mode_bits,
+            page_size=settings.page_size,
+            pages={},
+            sort_by=settings.view.sort_by,
+            index=index,
+        )
+        vc = VCStatus()
 
     current = None
     filter_pattern = None
@@ -51,10 +78,13 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
     state = State(
         id=uuid4(),
         executor=executor,
+        watcher=watcher,
         settings=settings,
         session=session,
         vim_focus=True,
         index=index,
+        viewed={path: None for path in index},
+        pages={},
         selection=selection,
         filter_pattern=filter_pattern,
         show_hidden=show_hidden,
@@ -66,6 +96,7 @@ async def initial(settings: Settings, th: ThreadPoolExecutor) -> State:
         root=node,
         markers=marks,
         diagnostics={},
+        summaries={},
         vc=vc,
         current=current,
         window_order={},
@@ -9,7 +9,16 @@ from ..fs.cartographer import update
 from ..fs.types import Node
 from ..nvim.types import Markers
 from ..version_ctl.types import VCStatus
-from .types import Diagnostics, FilterPattern, Index, Selection, Session, State
+from .preview import stream
+from .types import (
+    Diagnostics,
+    FilterPattern,
+    Index,
+    Selection,
+    Session,
+    State,
+    Summaries,
+)
 
 
 async def forward(
@@ -17,6 +26,8 @@ async def forward(
     *,
     root: Union[Node, VoidType] = Void,
     index: Union[Index, VoidType] = Void,
+    viewed: Union[Mapping[PurePath, None], VoidType] = Void,
+    pages: Union[Mapping[PurePath, int], VoidType] = Void,
     selection: Union[Selection, VoidType] = Void,
     filter_pattern: Union[Optional[FilterPattern], VoidType] = Void,
     show_hidden: Union[bool, VoidType] = Void,
@@ -27,19 +38,45 @@ async def forward(
     width: Union[int, VoidType] = Void,
     markers: Union[Markers, VoidType] = Void,
     diagnostics: Union[Diagnostics, VoidType] = Void,
+    summaries: Union[Summaries, VoidType] = Void,
     vc: Union[VCStatus, VoidType] = Void,
     current: Union[PurePath, VoidType] = Void,
     invalidate_dirs: Union[AbstractSet[PurePath], VoidType] = Void,
+    rewalk_dirs: Union[AbstractSet[PurePath], VoidType] = Void,
     window_order: Union[Mapping[ExtData, None], VoidType] = Void,
     session: Union[Session, VoidType] = Void,
     vim_focus: Union[bool, VoidType] = Void,
     trace: bool = True,
 ) -> State:
     new_index = or_else(index, state.index)
+    new_viewed = or_else(viewed, state.viewed)
+    if new_index is not state.index or new_viewed is not state.viewed:
+        new_viewed = {
+            **{path: None for path in new_viewed if path in new_index},
+            **{path: None for path in new_index if path not in new_viewed},
+        }
+    new_pages = or_else(pages, state.pages)
+    if new_index is not state.index or new_pages is not state.pages:
+        new_pages = {
+            path: count for path, count in new_pages.items() if path in new_index
+        }
     new_selection = or_else(selection, state.selection)
     new_filter_pattern = or_else(filter_pattern, state.filter_pattern)
     new_current = or_else(current, state.current)
     new_follow_links = or_else(follow_links, state.follow_links)
+    state.watcher.watch(
+        root.path if isinstance(root, Node) else state.root.path, index=new_index
+    )
+    rewalk = {
+        *or_else(rewalk_dirs, frozenset()),
+        *(new_index ^ state.index),
+        *(
+            path
+            for path in new_pages.keys() | state.pages.keys()
+            if path in new_index and new_pages.get(path) != state.pages.get(path)
+        ),
+        *((state.root.path,) if new_follow_links != state.follow_links else ()),
+    }
     new_root = cast(
         Node,
         root
@@ -48,10 +85,17 @@ async def forward(
                 state.executor,
                 root=state.root,
                 follow_links=new_follow_links,
+                one_file_system=state.settings.one_file_system,
+                mode_bits=state.settings.mode_bits,
+                page_size=state.settings.page_size,
+                pages=new_pages,
+                sort_by=state.settings.view.sort_by,
                 index=new_index,
-                invalidate_dirs=invalidate_dirs,
+                invalidate_dirs=or_else(invalidate_dirs, frozenset()),
+                rewalk_dirs=rewalk,
+                progress=stream(state, index=new_index, follow_links=new_follow_links),
             )
-            if not isinstance(invalidate_dirs, VoidType)
+            if not isinstance(invalidate_dirs, VoidType) or rewalk
             else state.root
         ),
     )
@@ -63,10 +107,13 @@ async def forward(
     new_state = State(
         id=uuid4(),
         executor=state.executor,
+        watcher=state.watcher,
         settings=state.settings,
         session=or_else(session, state.session),
         vim_focus=new_vim_focus,
         index=new_index,
+        viewed=new_viewed,
+        pages=new_pages,
         selection=new_selection,
         filter_pattern=new_filter_pattern,
         show_hidden=new_hidden,
@@ -78,6 +125,7 @@ async def forward(
         root=new_root,
         markers=new_markers,
         diagnostics=or_else(diagnostics, state.diagnostics),
+        summaries=or_else(summaries, state.summaries),
         vc=new_vc,
         current=new_current,
         window_order=or_else(window_order, state.window_order),
@@ -1,20 +1,31 @@
 from hashlib import sha1
 from json import dumps, loads
+from marshal import dumps as m_dumps
+from marshal import loads as m_loads
 from os.path import normcase
 from pathlib import Path, PurePath
 from tempfile import NamedTemporaryFile
-from typing import Any, MutableMapping, Optional
+from typing import Any, Iterator, MutableMapping, Optional, Tuple
 
 from pynvim_pp.lib import decode, encode
 from std2.asyncio import to_thread
 from std2.pickle.decoder import new_decoder
 from std2.pickle.encoder import new_encoder
 
-from .types import Session, State, StoredSession
+from ..fs.cartographer import snapshot
+from ..fs.types import Fingerprint, Listing, Mode, Node, Stat
+from ..settings.types import Settings
+from ..version_ctl.types import VCStatus
+from ..view.sort import needs_stats
+from .types import Session, Snapshot, State, StoredSession
 
 _DECODER = new_decoder[StoredSession](StoredSession)
 _ENCODER = new_encoder[StoredSession](StoredSession)
 
+_SNAPSHOT_VERSION = (4, len(Mode))
+
+_Node = Tuple[str, int, Optional[str], Optional[Tuple[int, int]]]
+
 
 def _session_path(cwd: PurePath, storage: Path) -> Path:
     hashed = sha1(normcase(cwd).encode()).hexdigest()
@@ -22,6 +33,96 @@ def _session_path(cwd: PurePath, storage: Path) -> Path:
     return part.with_suffix(".json")
 
 
+def _snapshot_path(cwd: PurePath, storage: Path) -> Path:
+    return _session_path(cwd, storage=storage).with_suffix(".snapshot")
+
+
+def _dump_node(node: Node) -> _Node:
+    pointed = None if node.pointed is None else str(node.pointed)
+    stat = None if node.stat is None else (node.stat.size, node.stat.mtime_ns)
+    return node.path.name, node.mask, pointed, stat
+
+
+def _load_node(parent: PurePath, node: _Node) -> Node:
+    name, mask, pointed, stat = node
+    return Node(
+        path=parent / name,
+        mask=mask,
+        pointed=None if pointed is None else PurePath(pointed),
+        stat=None if stat is None else Stat(*stat),
+    )
+
+
+def _encode_snapshot(root: Node, vc: VCStatus, mode_bits: bool, stats: bool) -> bytes:
+    def cont() -> Iterator[Any]:
+        for path, listing in snapshot(root).items():
+            if (listing.mode_bits, listing.stats) != (mode_bits, stats):
+                continue
+            fp = listing.fingerprint
+            yield (
+                str(path),
+                (fp.st_dev, fp.st_ino, fp.st_mtime_ns, fp.st_ctime_ns),
+                tuple(map(_dump_node, listing.children.values())),
+                listing.total,
+            )
+
+    dumped = (
+        _SNAPSHOT_VERSION,
+        (mode_bits, stats),
+        str(root.path.parent),
+        _dump_node(root),
+        tuple(cont()),
+        tuple(map(str, vc.ignored)),
+        tuple((str(path), stat) for path, stat in vc.status.items()),
+    )
+    return m_dumps(dumped)
+
+
+def _decode_snapshot(raw: bytes, mode_bits: bool, stats: bool) -> Snapshot:
+    version, shape, parent, root, listings, ignored, status = m_loads(raw)
+    if tuple(version) != _SNAPSHOT_VERSION:
+        raise ValueError(version)
+    elif tuple(shape) != (mode_bits, stats):
+        raise ValueError(shape)
+
+    def cont() -> Iterator[Tuple[PurePath, Listing]]:
+        for raw_path, fp, children, total in listings:
+            path = PurePath(raw_path)
+            fingerprint = Fingerprint(*fp)
+            nodes = (_load_node(path, node=child) for child in children)
+            listing = Listing(
+                fingerprint=fingerprint,
+                children={node.path: node for node in nodes},
+                total=total,
+                mode_bits=mode_bits,
+                stats=stats,
+            )
+            yield path, listing
+
+    vc = VCStatus(
+        ignored={*map(PurePath, ignored)},
+        status={PurePath(path): stat for path, stat in status},
+    )
+    return Snapshot(
+        root=_load_node(PurePath(parent), node=root),
+        listings={path: listing for path, listing in cont()},
+        vc=vc,
+    )
+
+
+async def _atomic_write(path: Path, data: bytes) -> None:
+    parent = path.parent
+
+    def cont() -> None:
+        parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=parent, delete=False) as f:
+            f.write(data)
+
+        Path(f.name).replace(path)
+
+    await to_thread(cont)
+
+
 async def _load_json(path: Path) -> Optional[Any]:
     def cont() -> Optional[Any]:
         try:
@@ -56,14 +157,33 @@ async def dump_session(state: State) -> None:
 
     json = _ENCODER(stored)
     path = _session_path(state.session.workdir, storage=state.session.storage)
-    parent = path.parent
     dumped = encode(dumps(json, ensure_ascii=False, check_circular=False, indent=2))
+    await _atomic_write(path, data=dumped)
 
-    def cont() -> None:
-        parent.mkdir(parents=True, exist_ok=True)
-        with NamedTemporaryFile(dir=parent, delete=False) as f:
-            f.write(dumped)
 
-        Path(f.name).replace(path)
+async def load_snapshot(session: Session, settings: Settings) -> Optional[Snapshot]:
+    path = _snapshot_path(session.workdir, storage=session.storage)
+    stats = needs_stats(settings.view.sort_by)
 
-    await to_thread(cont)
+    def cont() -> Optional[Snapshot]:
+        try:
+            snapshot = _decode_snapshot(
+                path.read_bytes(), mode_bits=settings.mode_bits, stats=stats
+            )
+        except Exception:
+            return None
+        else:
+            return snapshot if snapshot.root.path == session.workdir else None
+
+    return await to_thread(cont)
+
+
+async def dump_snapshot(state: State) -> None:
+    path = _snapshot_path(state.session.workdir, storage=state.session.storage)
+    stats = needs_stats(state.settings.view.sort_by)
+    dumped = await to_thread(
+        lambda: _encode_snapshot(
+            state.root, vc=state.vc, mode_bits=state.settings.mode_bits, stats=stats
+        )
+    )
+    await _atomic_write(path, data=dumped)
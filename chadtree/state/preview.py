@@ -0,0 +1,33 @@
+from asyncio import get_running_loop
+from dataclasses import replace
+from typing import Callable, Optional
+
+from std2.cell import RefCell
+
+from ..fs.types import Node
+from .types import Index, State
+
+_SINK = RefCell[Optional[Callable[[State], None]]](None)
+
+
+def connect(sink: Callable[[State], None]) -> None:
+    _SINK.val = sink
+
+
+def stream(
+    state: State, *, index: Index, follow_links: bool
+) -> Optional[Callable[[Node], None]]:
+    """
+    Partial `root` -> provisional redraw, callable from any thread
+    """
+
+    if not (sink := _SINK.val):
+        return None
+    else:
+        loop = get_running_loop()
+
+        def cont(root: Node) -> None:
+            partial = replace(state, root=root, index=index, follow_links=follow_links)
+            loop.call_soon_threadsafe(sink, partial)
+
+        return cont
@@ -5,7 +5,8 @@ from uuid import UUID
 
 from pynvim_pp.rpc_types import ExtData
 
-from ..fs.types import Node
+from ..fs.types import Listing, Node, Summary
+from ..fs.watch import Watcher
 from ..nvim.types import Markers
 from ..settings.types import Settings
 from ..version_ctl.types import VCStatus
@@ -14,6 +15,7 @@ from .executor import AsyncExecutor
 Index = AbstractSet[PurePath]
 Selection = Index
 Diagnostics = Mapping[PurePath, Mapping[int, int]]
+Summaries = Mapping[PurePath, Summary]
 
 
 @dataclass(frozen=True)
@@ -31,6 +33,7 @@ class Session:
 class State:
     id: UUID
     executor: AsyncExecutor
+    watcher: Watcher
     settings: Settings
     session: Session
     follow_links: bool
@@ -41,6 +44,8 @@ class State:
     filter_pattern: Optional[FilterPattern]
     follow: bool
     index: Index
+    viewed: Mapping[PurePath, None]
+    pages: Mapping[PurePath, int]
     markers: Markers
     root: Node
     selection: Selection
@@ -48,6 +53,7 @@ class State:
     vc: VCStatus
     width: int
     diagnostics: Diagnostics
+    summaries: Summaries
     window_order: Mapping[ExtData, None]
     node_row_lookup: Sequence[Node]
 
@@ -59,3 +65,10 @@ class StoredSession:
     index: Index
     show_hidden: Optional[bool]
     enable_vc: Optional[bool]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    root: Node
+    listings: Mapping[PurePath, Listing]
+    vc: VCStatus
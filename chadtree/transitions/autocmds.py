@@ -1,5 +1,5 @@
 from __future__ import annotations
-from asyncio import Task, create_task, sleep
+from asyncio import Task, create_task, gather, sleep
 from collections.abc import Sequence
 from itertools import chain
 from typing import Optional
@@ -18,9 +18,10 @@ from ..nvim.markers import markers
 from ..registry import NAMESPACE, autocmd, rpc
 from ..settings.types import Settings
 from ..state.next import forward
-from ..state.ops import dump_session
+from ..state.ops import dump_session, dump_snapshot
 from ..state.types import State
 from .shared.current import new_current_file, new_root
+from .shared.prefetch import prefetch_idle
 from .shared.wm import (
     find_current_buffer_path,
     find_fm_buffers,
@@ -58,6 +59,7 @@ async def _when_idle(state: State) -> None:
         await sleep(state.settings.idle_timeout)
         diagnostics = await poll(state.settings.min_diagnostics_severity)
         await forward(state, diagnostics=diagnostics)
+        await prefetch_idle(state)
 
     _CELL.val = create_task(cont())
 
@@ -71,7 +73,7 @@ async def save_session(state: State) -> None:
     Save CHADTree state
     """
 
-    await dump_session(state)
+    await gather(dump_session(state), dump_snapshot(state))
 
 
 _ = autocmd("ExitPre") << f"lua {NAMESPACE}.{save_session.method}()"
@@ -87,7 +89,7 @@ async def focus_lost(state: State) -> Stage:
     Save CHADTree state
     """
 
-    await dump_session(state)
+    await gather(dump_session(state), dump_snapshot(state))
     new_state = await forward(state, vim_focus=False)
     return Stage(new_state)
 
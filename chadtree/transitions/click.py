@@ -9,7 +9,7 @@ from ..registry import rpc
 from ..settings.localization import LANG
 from ..state.next import forward
 from ..state.types import State
-from .shared.index import indices
+from .shared.index import indices, pager
 from .shared.open_file import open_file
 from .shared.wm import find_fm_windows
 from .types import ClickType, Stage
@@ -18,6 +18,11 @@ from .types import ClickType, Stage
 async def _click(
     state: State, is_visual: bool, click_type: ClickType
 ) -> Optional[Stage]:
+    if more := await pager(state):
+        pages = {**state.pages, more.path: state.pages.get(more.path, 1) + 1}
+        new_state = await forward(state, pages=pages, invalidate_dirs=frozenset())
+        return Stage(new_state)
+
     node = await anext(indices(state, is_visual=is_visual), None)
 
     if not node:
@@ -37,11 +42,10 @@ async def _click(
                     return None
                 else:
                     index = state.index ^ {node.path}
-                    invalidate_dirs = {node.path}
                     new_state = await forward(
                         state,
                         index=index,
-                        invalidate_dirs=invalidate_dirs,
+                        invalidate_dirs=frozenset(),
                     )
                     return Stage(new_state)
             else:
@@ -0,0 +1,69 @@
+from typing import Optional
+
+from pynvim_pp.nvim import Nvim
+from std2 import anext
+
+from ..fs.cartographer import act_like_dir, reach
+from ..registry import rpc
+from ..settings.localization import LANG
+from ..state.next import forward
+from ..state.types import State
+from .shared.index import indices
+from .types import Stage
+
+
+async def _expand_to(
+    state: State, is_visual: bool, depth: Optional[int]
+) -> Optional[Stage]:
+    node = await anext(indices(state, is_visual=is_visual), None)
+    if not node:
+        return None
+    else:
+        if act_like_dir(node, follow_links=state.follow_links):
+            path = node.path
+        else:
+            path = node.path.parent
+
+        reached, stopped = await reach(
+            state.executor,
+            path,
+            depth=depth,
+            follow_links=state.follow_links,
+            one_file_system=state.settings.one_file_system,
+            mode_bits=state.settings.mode_bits,
+            page_size=state.settings.page_size,
+            pages=state.pages,
+            sort_by=state.settings.view.sort_by,
+            ignores=None if state.show_hidden else state.settings.ignores,
+            origin=state.root.pointed or state.root.path,
+        )
+        if stopped:
+            await Nvim.write(LANG("expand_stopped", count=f"{stopped:,}"))
+
+        index = state.index | reached
+        new_state = await forward(state, index=index, invalidate_dirs=frozenset())
+        return Stage(new_state, focus=path)
+
+
+@rpc(blocking=False)
+async def _expand(state: State, is_visual: bool) -> Optional[Stage]:
+    """
+    Expand all subdirectories for directory at cursor
+    """
+
+    return await _expand_to(state, is_visual=is_visual, depth=None)
+
+
+@rpc(blocking=False)
+async def _expand_depth(state: State, is_visual: bool) -> Optional[Stage]:
+    """
+    Expand subdirectories for directory at cursor, up to a depth
+    """
+
+    ans = await Nvim.input(question=LANG("expand_depth"), default="2")
+    try:
+        depth = int(ans or "")
+    except ValueError:
+        return None
+    else:
+        return await _expand_to(state, is_visual=is_visual, depth=max(1, depth))
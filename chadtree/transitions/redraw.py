@@ -30,6 +30,7 @@ _HOME = Path.home()
 
 async def _derived(state: State) -> Derived:
     return await render(
+        state.executor,
         state.root,
         settings=state.settings,
         index=state.index,
@@ -37,6 +38,7 @@ async def _derived(state: State) -> Derived:
         filter_pattern=state.filter_pattern,
         markers=state.markers,
         diagnostics=state.diagnostics,
+        summaries=state.summaries,
         vc=state.vc,
         follow_links=state.follow_links,
         show_hidden=state.show_hidden,
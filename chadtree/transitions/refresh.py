@@ -20,4 +20,4 @@ async def with_manual() -> AsyncIterator[None]:
 @rpc(blocking=False)
 async def refresh(state: State, is_visual: bool) -> Stage:
     async with with_manual():
-        return await _refresh(state)
+        return await _refresh(state, force=True)
@@ -5,6 +5,7 @@ from pynvim_pp.nvim import Nvim
 from pynvim_pp.rpc_types import NvimError
 from std2.asyncio import pure
 
+from ..fs.summary import summarize
 from ..lsp.diagnostics import poll
 from ..registry import rpc
 from ..state.next import forward
@@ -22,16 +23,21 @@ async def scheduled_update(state: State, init: bool = False) -> Optional[Stage]:
     store = dump_session(state) if state.vim_focus else pure(None)
 
     try:
-        stage, diagnostics, vc, _ = await gather(
+        stage, diagnostics, vc, summaries, _ = await gather(
             refresh(state=state),
             poll(state.settings.min_diagnostics_severity),
             status(cwd, prev=state.vc)
             if not init and state.enable_vc
-            else pure(VCStatus()),
+            else pure(state.vc if state.enable_vc else VCStatus()),
+            summarize(state.executor, root=state.root)
+            if state.settings.folder_summary
+            else pure(state.summaries),
             store,
         )
     except NvimError:
         return None
     else:
-        new_state = await forward(stage.state, diagnostics=diagnostics, vc=vc)
+        new_state = await forward(
+            stage.state, diagnostics=diagnostics, vc=vc, summaries=summaries
+        )
         return Stage(new_state, focus=stage.focus)
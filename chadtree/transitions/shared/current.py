@@ -7,6 +7,7 @@ from std2.pathlib import is_relative_to, longest_common_path
 from ...fs.cartographer import new
 from ...fs.ops import ancestors
 from ...state.next import forward
+from ...state.preview import stream
 from ...state.types import State
 from ..types import Stage
 
@@ -40,7 +41,17 @@ async def new_root(
 ) -> State:
     index = state.index | ancestors(new_cwd) | {new_cwd} | indices
     root = await new(
-        state.executor, follow_links=state.follow_links, root=new_cwd, index=index
+        state.executor,
+        root=new_cwd,
+        prev=state.root,
+        follow_links=state.follow_links,
+        one_file_system=state.settings.one_file_system,
+        mode_bits=state.settings.mode_bits,
+        page_size=state.settings.page_size,
+        pages=state.pages,
+        sort_by=state.settings.view.sort_by,
+        index=index,
+        progress=stream(state, index=index, follow_links=state.follow_links),
     )
     selection = {path for path in state.selection if root.path in ancestors(path)}
     return await forward(state, root=root, selection=selection, index=index)
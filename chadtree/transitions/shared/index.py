@@ -3,18 +3,35 @@ from typing import AsyncIterator, Optional
 from pynvim_pp.operators import operator_marks
 from pynvim_pp.window import Window
 
-from ...fs.types import Node
+from ...fs.types import Node, Pager
 from ...state.types import State
 from .wm import is_fm_buffer
 
 
-def _row_index(state: State, row: int) -> Optional[Node]:
+def _row_node(state: State, row: int) -> Optional[Node]:
     if (row >= 0) and (row < len(state.node_row_lookup)):
         return state.node_row_lookup[row]
     else:
         return None
 
 
+def _row_index(state: State, row: int) -> Optional[Node]:
+    node = _row_node(state, row=row)
+    return None if isinstance(node, Pager) else node
+
+
+async def pager(state: State) -> Optional[Pager]:
+    win = await Window.get_current()
+    buf = await win.get_buf()
+
+    if not await is_fm_buffer(buf):
+        return None
+    else:
+        row, _ = await win.get_cursor()
+        node = _row_node(state, row=row)
+        return node if isinstance(node, Pager) and node.more else None
+
+
 async def indices(state: State, is_visual: bool) -> AsyncIterator[Node]:
     win = await Window.get_current()
     buf = await win.get_buf()
@@ -0,0 +1,87 @@
+from pathlib import PurePath
+from typing import (
+    AbstractSet,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+)
+
+from pynvim_pp.nvim import Nvim
+
+from ...fs.cartographer import is_dir, lookup
+from ...fs.ops import ancestors
+from ...fs.types import Node
+from ...state.types import Index, State
+from .wm import find_fm_windows
+
+
+async def _on_screen(state: State) -> AbstractSet[PurePath]:
+    lookup = state.node_row_lookup
+    on_screen = set()
+    async for win, _ in find_fm_windows():
+        lo = await Nvim.fn.line(int, "w0", win)
+        hi = await Nvim.fn.line(int, "w$", win)
+        for node in lookup[max(0, lo - 1) : hi]:
+            on_screen.add(node.path if is_dir(node) else node.path.parent)
+    return on_screen
+
+
+def _counts(root: Node, index: Index) -> Mapping[PurePath, int]:
+    return {
+        path: len(node.children)
+        for path in index
+        if (node := lookup(root, path=path)) and node.children
+    }
+
+
+async def evict(
+    state: State, index: Index, current: Optional[PurePath]
+) -> Tuple[Index, Mapping[PurePath, None]]:
+    """
+    Collapse least recently viewed folders over the limits
+    """
+
+    on_screen = await _on_screen(state)
+    viewed = {
+        **{path: None for path in state.viewed if path not in on_screen},
+        **{path: None for path in on_screen if path in index},
+    }
+    counts = _counts(state.root, index=index)
+    max_folders, max_nodes = state.settings.max_open_folders, state.settings.max_nodes
+    folders, nodes = len(index), sum(counts.get(path, 0) for path in index)
+
+    if folders <= max_folders and nodes <= max_nodes:
+        return index, viewed
+    else:
+        pinned = {
+            state.root.path,
+            *on_screen,
+            *(ancestors(current) if current else ()),
+        }
+        protected = ancestors(*pinned) | pinned
+        nested: MutableMapping[PurePath, List[PurePath]] = {}
+        for path in index:
+            nested.setdefault(path.parent, []).append(path)
+
+        def subtree(path: PurePath) -> Iterator[PurePath]:
+            stack = [path]
+            while stack:
+                path = stack.pop()
+                yield path
+                stack.extend(nested.pop(path, ()))
+
+        evicted = set()
+        for path in viewed:
+            if folders <= max_folders and nodes <= max_nodes:
+                break
+            elif path not in protected and path not in evicted:
+                for gone in subtree(path):
+                    if gone in index and gone not in evicted:
+                        evicted.add(gone)
+                        folders -= 1
+                        nodes -= counts.get(gone, 0)
+
+        return index - evicted, viewed
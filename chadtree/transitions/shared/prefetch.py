@@ -0,0 +1,72 @@
+from itertools import islice
+from pathlib import PurePath
+from typing import Iterator, Optional
+
+from pynvim_pp.window import Window
+from std2.pathlib import is_relative_to
+
+from ...fs.cartographer import act_like_dir, lookup, prefetch
+from ...state.types import State
+from .wm import is_fm_buffer
+
+_RECENT = 4
+
+
+async def _cursor(state: State) -> Optional[int]:
+    win = await Window.get_current()
+    buf = await win.get_buf()
+    if not await is_fm_buffer(buf):
+        return None
+    else:
+        row, _ = await win.get_cursor()
+        return row if row < len(state.node_row_lookup) else None
+
+
+def _candidates(state: State, row: Optional[int]) -> Iterator[PurePath]:
+    if row is not None:
+        cursor = state.node_row_lookup[row]
+        siblings = sorted(
+            (
+                (abs(r - row), node.path)
+                for r, node in enumerate(state.node_row_lookup)
+                if node.path.parent == cursor.path.parent
+                and act_like_dir(node, follow_links=state.follow_links)
+            )
+        )
+        yield from (path for _, path in siblings)
+
+    for path in islice(reversed(tuple(state.viewed)), _RECENT):
+        if parent := lookup(state.root, path=path.parent):
+            yield from (
+                node.path
+                for node in parent.children.values()
+                if act_like_dir(node, follow_links=state.follow_links)
+            )
+
+    if state.current:
+        yield from (
+            path
+            for path in reversed(state.current.parents)
+            if is_relative_to(path, state.root.path)
+        )
+
+
+async def prefetch_idle(state: State) -> None:
+    """
+    Warm listings of folders likely to be expanded next
+    """
+
+    row = await _cursor(state)
+    paths = tuple(
+        path
+        for path in dict.fromkeys(_candidates(state, row=row))
+        if path not in state.index
+    )
+    if paths:
+        await prefetch(
+            state.executor,
+            paths,
+            mode_bits=state.settings.mode_bits,
+            page_size=state.settings.page_size,
+            sort_by=state.settings.view.sort_by,
+        )
@@ -1,36 +1,58 @@
 from asyncio import gather
 from pathlib import PurePath
-from typing import AbstractSet, Mapping
+from typing import AbstractSet, Mapping, Optional
 
 from pynvim_pp.rpc_types import ExtData
 from pynvim_pp.window import Window
 from std2.types import Void
 
+from ...fs.cartographer import stale
 from ...fs.ops import ancestors, exists_many
 from ...nvim.markers import markers
 from ...state.next import forward
 from ...state.types import State
+from ..shared.lru import evict
 from ..shared.wm import find_current_buffer_path
 from ..types import Stage
 
 
-async def _index(state: State, paths: AbstractSet[PurePath]) -> AbstractSet[PurePath]:
-    index = {
-        path
-        for path, exists in (await exists_many(state.index, follow=True)).items()
-        if exists
-    } | paths
+def _suspects(
+    state: State,
+    paths: AbstractSet[PurePath],
+    changed: Optional[AbstractSet[PurePath]],
+) -> AbstractSet[PurePath]:
+    if changed is None:
+        return paths
+    else:
+        watched = state.watcher.watched
+        return {
+            path
+            for path in paths
+            if path in changed
+            or path.parent in changed
+            or not (path in watched or path.parent in watched)
+        }
+
+
+async def _index(
+    state: State,
+    paths: AbstractSet[PurePath],
+    changed: Optional[AbstractSet[PurePath]],
+) -> AbstractSet[PurePath]:
+    suspects = _suspects(state, paths=state.index, changed=changed)
+    existence = await exists_many(suspects, follow=True)
+    index = {path for path in state.index if existence.get(path, True)} | paths
 
     return index
 
 
-async def _selection(state: State) -> AbstractSet[PurePath]:
+async def _selection(
+    state: State, changed: Optional[AbstractSet[PurePath]]
+) -> AbstractSet[PurePath]:
+    suspects = _suspects(state, paths=state.selection, changed=changed)
+    existence = await exists_many(suspects, follow=False)
     selection = {
-        selected
-        for selected, exists in (
-            await exists_many(state.selection, follow=False)
-        ).items()
-        if exists
+        selected for selected in state.selection if existence.get(selected, True)
     }
 
     return selection
@@ -44,14 +66,17 @@ async def _window_order(state: State) -> Mapping[ExtData, None]:
     return window_order
 
 
-async def refresh(state: State) -> Stage:
+async def _refresh(
+    state: State,
+    invalidate_dirs: AbstractSet[PurePath],
+    rewalk_dirs: AbstractSet[PurePath],
+    changed: Optional[AbstractSet[PurePath]],
+) -> Stage:
     cwd = state.root.path
-    invalidate_dirs = {cwd}
-
     current, index, selection, window_order, mks = await gather(
         find_current_buffer_path(),
-        _index(state, paths=invalidate_dirs),
-        _selection(state),
+        _index(state, paths={cwd}, changed=changed),
+        _selection(state, changed=changed),
         _window_order(state),
         markers(),
     )
@@ -61,18 +86,44 @@ async def refresh(state: State) -> Stage:
     parent_paths: AbstractSet[PurePath] = (
         current_ancestors if state.follow else frozenset()
     )
-    new_index = index if new_current else index | parent_paths
     focus = current if state.follow else None
+    new_index, viewed = await evict(
+        state, index=index if new_current else index | parent_paths, current=current
+    )
+    dirty = {*invalidate_dirs, *(new_index - state.index)}
 
     new_state = await forward(
         state,
         index=new_index,
+        viewed=viewed,
         selection=selection,
         markers=mks,
-        invalidate_dirs=invalidate_dirs,
+        invalidate_dirs=dirty or Void,
+        rewalk_dirs=rewalk_dirs,
         current=new_current or Void,
         window_order=window_order,
         trace=False,
     )
 
     return Stage(new_state, focus=focus)
+
+
+async def refresh(state: State, force: bool = False) -> Stage:
+    changed = state.watcher.drain()
+    if force or changed is None:
+        invalidate_dirs: AbstractSet[PurePath] = {state.root.path}
+        rewalk_dirs: AbstractSet[PurePath] = frozenset()
+    else:
+        invalidate_dirs = stale(changed)
+        rewalk_dirs = changed.keys() - invalidate_dirs
+    try:
+        return await _refresh(
+            state,
+            invalidate_dirs=invalidate_dirs,
+            rewalk_dirs=rewalk_dirs,
+            changed=None if force or changed is None else changed.keys(),
+        )
+    except BaseException:
+        if changed:
+            state.watcher.mark(changed)
+        raise
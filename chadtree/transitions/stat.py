@@ -32,4 +32,7 @@ async def stat(state: State, is_visual: bool) -> None:
             name = display_path(node.path, state=state)
             full_name = f"{name} -> {stat.link}" if stat.link else name
             mode_line = f"{permissions} {size}b {user} {group} {mtime} {full_name}"
+            if summary := state.summaries.get(node.path):
+                total = si_prefixed(summary.size, precision=2)
+                mode_line += f" ({total}b, {summary.files:,})"
             await Nvim.write(mode_line)
@@ -1,8 +1,14 @@
+from fnmatch import translate
+from functools import lru_cache
 from itertools import chain
 from os import environ
-from typing import Mapping, Tuple, TypeVar, Union
+from os.path import normcase
+from pathlib import PurePath
+from re import compile
+from typing import Callable, Iterator, Mapping, Optional, Tuple, TypeVar, Union
 
 from pynvim_pp.highlight import HLgroup
+from std2.platform import OS, os
 from std2.types import never
 
 from chad_types import (
@@ -15,9 +21,10 @@ from chad_types import (
 )
 
 from ..consts import FM_HL_PREFIX
+from ..fs.types import Mode
 from .highlight import gen_hl
 from .ls_colours import parse_lsc
-from .types import HLcontext, HLGroups
+from .types import HLcontext, HLGroups, Resolver
 
 T = TypeVar("T")
 
@@ -26,6 +33,74 @@ def _trans(mapping: Mapping[T, HLgroup]) -> Mapping[T, str]:
     return {k: v.name for k, v in mapping.items()}
 
 
+def _suffixes(name: str) -> Iterator[str]:
+    if suffixes := PurePath(name).suffixes:
+        for idx in range(len(suffixes)):
+            yield "".join(suffixes[idx:])
+    else:
+        yield name
+
+
+def _ext(mapping: Mapping[str, T], name: str) -> Optional[T]:
+    return next(
+        (val for suffix in _suffixes(name) if (val := mapping.get(suffix))), None
+    )
+
+
+def _globs(globs: Mapping[str, T]) -> Callable[[str], Optional[T]]:
+    vals = tuple(globs.values())
+    alts = "|".join(
+        f"(?P<_{idx}>{translate(normcase(pattern))})"
+        for idx, pattern in enumerate(globs)
+    )
+    regex = compile(alts) if alts else None
+
+    def cont(name: str) -> Optional[T]:
+        if regex and (match := regex.match(normcase(name))) and match.lastgroup:
+            return vals[int(match.lastgroup[1:])]
+        else:
+            return None
+
+    return cont
+
+
+def _resolver(icons: IconGlyphs, context: HLcontext) -> Resolver:
+    icon_glob = _globs(icons.name_glob)
+    text_glob = _globs(context.name_glob)
+    skip = {Mode.other_writable} if os is OS.windows else set()
+
+    def text_hl(name: str, modes: Tuple[Mode, ...]) -> Optional[str]:
+        for mode in modes:
+            if mode not in skip and (hl := context.mode_pre.get(mode)):
+                return hl
+
+        if hl := (
+            context.name_exact.get(name)
+            or text_glob(name)
+            or _ext(context.ext_exact, name=name)
+        ):
+            return hl
+
+        for mode in modes:
+            if hl := context.mode_post.get(mode):
+                return hl
+        else:
+            return context.mode_post.get(None)
+
+    @lru_cache(maxsize=10000)
+    def resolve(name: str, mask: int) -> Tuple[str, Optional[str], Optional[str]]:
+        modes = tuple(mode for mode in Mode if mask & (1 << mode))
+        icon = (
+            icons.name_exact.get(name, "")
+            or _ext(icons.ext_exact, name=name)
+            or icon_glob(name)
+            or icons.default_icon
+        )
+        return icon, _ext(context.icon_exts, name=name), text_hl(name, modes=modes)
+
+    return resolve
+
+
 def load_theme(
     artifact: Artifact,
     particular_mappings: HLGroups,
@@ -33,7 +108,11 @@ def load_theme(
     icon_set: IconGlyphSetEnum,
     icon_colour_set: IconColourSetEnum,
     text_colour_set: Union[LSColoursEnum, TextColourSetEnum],
-) -> Tuple[IconGlyphs, HLcontext]:
+) -> Tuple[IconGlyphs, HLcontext, Resolver]:
+    """
+    Globs & suffixes are compiled into one `(name, mode mask)` lookup
+    """
+
     if icon_set is IconGlyphSetEnum.ascii:
         icons = artifact.icons.ascii
     elif icon_set is IconGlyphSetEnum.ascii_hollow:
@@ -115,4 +194,4 @@ def load_theme(
         particular_mappings=particular_mappings,
     )
 
-    return icons, context
+    return icons, context, _resolver(icons, context=context)
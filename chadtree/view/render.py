@@ -1,93 +1,26 @@
-from collections import UserString
-from enum import IntEnum, auto
+from asyncio import get_running_loop
 from fnmatch import fnmatch
-from functools import lru_cache
-from locale import strxfrm
-from os.path import extsep, sep
+from os.path import sep
 from pathlib import PurePath
-from typing import (
-    Any,
-    AsyncIterator,
-    Awaitable,
-    Callable,
-    Iterator,
-    Optional,
-    Sequence,
-    Tuple,
-    Union,
-    cast,
-)
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple, cast
 
 from pynvim_pp.lib import encode
-from std2.platform import OS, os
-from std2.types import never
+from std2.locale import si_prefixed
 
 from ..fs.cartographer import is_dir, user_ignored
-from ..fs.types import Mode, Node
+from ..fs.types import Loading, Mode, Node, Pager
 from ..nvim.types import Markers
+from ..settings.localization import LANG
 from ..settings.types import Settings
-from ..state.types import Diagnostics, FilterPattern, Index, Selection
+from ..state.executor import AsyncExecutor
+from ..state.types import Diagnostics, FilterPattern, Index, Selection, Summaries
 from ..version_ctl.types import VCStatus
 from .ops import encode_for_display
-from .types import Badge, Derived, Highlight, Sortby
+from .sort import forget, sorted_children
+from .types import Badge, Derived, Highlight
 
-
-class _CompVals(IntEnum):
-    FOLDER = auto()
-    FILE = auto()
-
-
-_Str = Union[str, UserString]
-_Render = Tuple[str, Sequence[Highlight], Sequence[Badge]]
-_NRender = Tuple[Node, str, Sequence[Highlight], Sequence[Badge]]
-
-
-class _str(UserString):
-    def __lt__(self, _: _Str) -> bool:
-        return False
-
-    def __gt__(self, _: _Str) -> bool:
-        return True
-
-
-_EMPTY = _str("")
-
-
-def _suffixx(path: PurePath) -> _Str:
-    if path.suffix:
-        return strxfrm(path.suffix)
-    elif path.stem.startswith(extsep):
-        return strxfrm(path.stem)
-    else:
-        return _EMPTY
-
-
-def _lax_suffix(path: PurePath) -> str:
-    return path.suffix or path.name
-
-
-@lru_cache(maxsize=None)
-def _gen_comp(sortby: Sequence[Sortby]) -> Callable[[Node], Any]:
-    def comp(node: Node) -> Sequence[Any]:
-        if node.cache.sort_by is None:
-
-            def cont() -> Iterator[Any]:
-                for sb in sortby:
-                    if sb is Sortby.is_folder:
-                        yield _CompVals.FOLDER if is_dir(node) else _CompVals.FILE
-                    elif sb is Sortby.ext:
-                        yield "" if is_dir(node) else _suffixx(node.path)
-                    elif sb is Sortby.file_name_lower:
-                        yield strxfrm(node.path.name.casefold())
-                    elif sb is Sortby.file_name:
-                        yield strxfrm(node.path.name)
-                    else:
-                        never(sb)
-
-            node.cache.sort_by = tuple(cont())
-        return node.cache.sort_by
-
-    return comp
+_Render = Tuple[str, Sequence[Highlight], Sequence[Badge], str]
+_NRender = Tuple[Node, str, Sequence[Highlight], Sequence[Badge], str]
 
 
 def _vc_ignored(node: Node, vc: VCStatus) -> bool:
@@ -104,52 +37,25 @@ def _gen_spacer(depth: int) -> str:
     return (depth * 2 - 1) * " "
 
 
+def _hashed(line: str, highlights: Sequence[Highlight], badges: Sequence[Badge]) -> str:
+    return str(hash((line, highlights, badges)))
+
+
 def _paint(
     settings: Settings,
     index: Index,
     selection: Selection,
     markers: Markers,
     diagnostics: Diagnostics,
+    summaries: Summaries,
     vc: VCStatus,
     follow_links: bool,
     show_hidden: bool,
     current: Optional[PurePath],
-) -> Callable[[Node, int], Awaitable[Optional[_Render]]]:
+) -> Tuple[Callable[[Node, int], Optional[_Render]], Callable[[Node, int], _Render]]:
     icons = settings.view.icons
     context = settings.view.hl_context
-
-    def search_icon_hl(node: Node, ignored: bool) -> Optional[str]:
-        if ignored:
-            return context.particular_mappings.ignored
-        else:
-            return context.icon_exts.get(_lax_suffix(node.path))
-
-    def search_text_hl(node: Node, ignored: bool) -> Optional[str]:
-        if ignored:
-            return context.particular_mappings.ignored
-
-        s_modes = sorted(node.mode)
-        for mode in s_modes:
-            if os is OS.windows and mode is Mode.other_writable:
-                pass
-            elif hl := context.mode_pre.get(mode):
-                return hl
-
-        if hl := context.name_exact.get(node.path.name):
-            return hl
-
-        for pattern, hl in context.name_glob.items():
-            if fnmatch(node.path.name, pattern):
-                return hl
-
-        if hl := context.ext_exact.get(_lax_suffix(node.path)):
-            return hl
-
-        for mode in s_modes:
-            if hl := context.mode_post.get(mode):
-                return hl
-        else:
-            return context.mode_post.get(None)
+    resolve = settings.view.resolver
 
     def gen_status(path: PurePath) -> str:
         selected = (
@@ -162,7 +68,7 @@ def _paint(
         yield _gen_spacer(depth)
         yield gen_status(node.path)
 
-    def gen_icon(node: Node) -> Iterator[str]:
+    def gen_icon(node: Node, glyph: str) -> Iterator[str]:
         yield " "
         if is_dir(node):
             if node.pointed and not follow_links:
@@ -172,22 +78,7 @@ def _paint(
             else:
                 yield icons.folder.closed
         else:
-            yield (
-                (
-                    icons.name_exact.get(node.path.name, "")
-                    or icons.ext_exact.get(_lax_suffix(node.path), "")
-                    or next(
-                        (
-                            v
-                            for k, v in icons.name_glob.items()
-                            if fnmatch(node.path.name, k)
-                        ),
-                        icons.default_icon,
-                    )
-                )
-                if settings.view.use_icons
-                else icons.default_icon
-            )
+            yield glyph if settings.view.use_icons else icons.default_icon
         yield " "
 
     def gen_name(node: Node) -> Iterator[str]:
@@ -250,23 +141,50 @@ def _paint(
                 group=context.particular_mappings.version_control,
             )
 
+        if summary := summaries.get(path):
+            size = si_prefixed(summary.size, precision=1)
+            yield Badge(
+                text=f"{l}{size}b {summary.files:,}",
+                group=context.particular_mappings.ignored,
+            )
+
     def gen_highlights(
-        node: Node, pre: str, icon: str, name: str, ignored: bool
+        pre: str,
+        icon: str,
+        name: str,
+        icon_group: Optional[str],
+        text_group: Optional[str],
     ) -> Iterator[Highlight]:
         icon_begin = len(encode(pre))
         icon_end = icon_begin + len(encode(icon))
         text_begin = icon_end
         text_end = len(encode(name)) + text_begin
 
-        if icon_group := search_icon_hl(node, ignored=ignored):
+        if icon_group:
             hl = Highlight(group=icon_group, begin=icon_begin, end=icon_end)
             yield hl
 
-        if text_group := search_text_hl(node, ignored=ignored):
+        if text_group:
             hl = Highlight(group=text_group, begin=text_begin, end=text_end)
             yield hl
 
-    async def show(node: Node, depth: int) -> Optional[_Render]:
+    def show_pager(node: Node, depth: int) -> _Render:
+        pre = f"{_gen_spacer(depth)}{icons.status.not_selected}{icons.status.inactive}"
+        text = (
+            LANG("more_entries", count=f"{node.more:,}")
+            if node.more
+            else LANG("loading")
+        )
+        line = f"{pre} {text}"
+        hl = Highlight(
+            group=context.particular_mappings.ignored,
+            begin=len(encode(pre)),
+            end=len(encode(line)),
+        )
+        highlights = (hl,)
+        return line, highlights, (), _hashed(line, highlights, ())
+
+    def show(node: Node, depth: int) -> Optional[_Render]:
         _user_ignored = user_ignored(node, ignores=settings.ignores)
         vc_ignored = _vc_ignored(node, vc=vc)
         ignored = vc_ignored or _user_ignored
@@ -274,22 +192,48 @@ def _paint(
         if depth and _user_ignored and not show_hidden:
             return None
         else:
+            path = node.path
+            badges = tuple(gen_badges(path))
+            key = (
+                settings,
+                follow_links,
+                depth,
+                path in selection,
+                path == current,
+                path in index,
+                ignored,
+                badges,
+            )
+            if (row := node.row) and row[0] == key:
+                return cast(_Render, row[1])
+
+            glyph, icon_group, text_group = resolve(path.name, node.mask)
+            if ignored:
+                icon_group = text_group = context.particular_mappings.ignored
+
             pre = "".join(gen_decor_pre(node, depth=depth))
-            icon = "".join(gen_icon(node))
+            icon = "".join(gen_icon(node, glyph=glyph))
             name = "".join(gen_name(node))
             post = "".join(gen_decor_post(node))
 
             line = f"{pre}{icon}{name}{post}"
-            badges = tuple(gen_badges(node.path))
             highlights = tuple(
-                gen_highlights(node, pre=pre, icon=icon, name=name, ignored=ignored)
+                gen_highlights(
+                    pre=pre,
+                    icon=icon,
+                    name=name,
+                    icon_group=icon_group,
+                    text_group=text_group,
+                )
             )
-            return line, highlights, badges
+            rendered = line, highlights, badges, _hashed(line, highlights, badges)
+            node.row = (key, rendered)
+            return rendered
 
-    return show
+    return show, show_pager
 
 
-async def render(
+def _render(
     node: Node,
     *,
     settings: Settings,
@@ -298,55 +242,75 @@ async def render(
     filter_pattern: Optional[FilterPattern],
     markers: Markers,
     diagnostics: Diagnostics,
+    summaries: Summaries,
     vc: VCStatus,
     follow_links: bool,
     show_hidden: bool,
     current: Optional[PurePath],
 ) -> Derived:
-    show = _paint(
+    show, show_pager = _paint(
         settings,
         index=index,
         selection=selection,
         markers=markers,
         diagnostics=diagnostics,
+        summaries=summaries,
         vc=vc,
         follow_links=follow_links,
         show_hidden=show_hidden,
         current=current,
     )
-    comp = _gen_comp(settings.view.sort_by)
-    keep_open = {node.path}
-
-    async def rend(node: Node, *, depth: int, cleared: bool) -> AsyncIterator[_NRender]:
-        clear = (
-            cleared
-            or not filter_pattern
-            or fnmatch(node.path.name, filter_pattern.pattern)
-        )
-
-        if shown := await show(node, depth):
-
-            async def gen_children() -> AsyncIterator[_NRender]:
-                for child in sorted(node.children.values(), key=comp):
-                    async for r in rend(child, depth=depth + 1, cleared=clear):
-                        yield r
-
-            children = [r async for r in gen_children()]
-            if clear or children or node.path in keep_open:
-                yield (node, *shown)
-            for child in children:
-                yield child
-
-    rendered = [r async for r in rend(node, depth=0, cleared=False)]
-    _nodes, _lines, _highlights, _badges = zip(*rendered)
-    nodes, lines, highlights, badges = (
+    sort_by = settings.view.sort_by
+    keep_open = node.path
+
+    rows: List[Optional[_NRender]] = []
+    kept: List[int] = []
+    stack: List[Tuple[Node, int, bool, int, Optional[int]]] = [
+        (node, 0, False, -1, None)
+    ]
+    while stack:
+        node, depth, clear, parent, row = stack.pop()
+        if row is None:
+            clear = (
+                clear
+                or not filter_pattern
+                or fnmatch(node.path.name, filter_pattern.pattern)
+            )
+            if shown := show(node, depth):
+                row = len(rows)
+                rows.append((node, *shown))
+                kept.append(0)
+                stack.append((node, depth, clear, parent, row))
+                children = sorted_children(node, sort_by=sort_by)
+                stack.extend(
+                    (child, depth + 1, clear, row, None) for child in reversed(children)
+                )
+        else:
+            if clear and (node.more or isinstance(node, Loading)):
+                pager = Pager(path=node.path, mask=0, pointed=None, more=node.more)
+                rows.append((pager, *show_pager(pager, depth=depth + 1)))
+                kept.append(0)
+                kept[row] += 1
+            if clear or kept[row] or node.path == keep_open:
+                kept[row] += 1
+            else:
+                rows[row] = None
+            if parent >= 0:
+                kept[parent] += kept[row]
+
+    rendered = [row for row in rows if row]
+    forget(node.path for node, *_ in rendered if node.children)
+    _nodes, _lines, _highlights, _badges, _hashed = zip(*rendered)
+    nodes, lines, highlights, badges, hashed = (
         cast(Sequence[Node], _nodes),
         cast(Sequence[str], _lines),
         cast(Sequence[Sequence[Highlight]], _highlights),
         cast(Sequence[Sequence[Badge]], _badges),
+        cast(Sequence[str], _hashed),
     )
-    hashed = tuple(str(hash(zipped)) for zipped in zip(lines, highlights, badges))
-    path_row_lookup = {node.path: idx for idx, node in enumerate(nodes)}
+    path_row_lookup = {
+        node.path: idx for idx, node in enumerate(nodes) if not isinstance(node, Pager)
+    }
     derived = Derived(
         lines=lines,
         highlights=highlights,
@@ -356,3 +320,43 @@ async def render(
         path_row_lookup=path_row_lookup,
     )
     return derived
+
+
+async def render(
+    exec: AsyncExecutor,
+    node: Node,
+    *,
+    settings: Settings,
+    index: Index,
+    selection: Selection,
+    filter_pattern: Optional[FilterPattern],
+    markers: Markers,
+    diagnostics: Diagnostics,
+    summaries: Summaries,
+    vc: VCStatus,
+    follow_links: bool,
+    show_hidden: bool,
+    current: Optional[PurePath],
+) -> Derived:
+    """
+    Rendered off the main loop, on the threadpool
+    """
+
+    loop = get_running_loop()
+    return await loop.run_in_executor(
+        exec.threadpool,
+        lambda: _render(
+            node,
+            settings=settings,
+            index=index,
+            selection=selection,
+            filter_pattern=filter_pattern,
+            markers=markers,
+            diagnostics=diagnostics,
+            summaries=summaries,
+            vc=vc,
+            follow_links=follow_links,
+            show_hidden=show_hidden,
+            current=current,
+        ),
+    )
@@ -0,0 +1,208 @@
+from bisect import bisect_left, insort
+from collections import UserString
+from dataclasses import dataclass
+from enum import IntEnum, auto
+from functools import lru_cache
+from locale import LC_COLLATE, setlocale, strxfrm
+from operator import itemgetter
+from os.path import extsep
+from pathlib import PurePath
+from re import compile
+from threading import Lock
+from typing import (
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from std2.types import never
+
+from ..fs.types import Mode, Node, Stat, mode_mask
+from .types import Sortby
+
+_INTERN_SIZE = 2**17
+_FOLDER = mode_mask((Mode.folder,))
+_REORDER_RATIO = 16
+_DIGITS = compile(r"(\d+)")
+_STATS = {Sortby.size, Sortby.mtime}
+
+
+class _CompVals(IntEnum):
+    FOLDER = auto()
+    FILE = auto()
+
+
+_Str = Union[str, UserString]
+
+
+class _str(UserString):
+    def __lt__(self, _: _Str) -> bool:
+        return False
+
+    def __gt__(self, _: _Str) -> bool:
+        return True
+
+
+_EMPTY = _str("")
+
+
+_Entry = Tuple[Tuple[Any, ...], str, PurePath]
+
+
+@dataclass(frozen=True)
+class _Order:
+    sort_by: Sequence[Sortby]
+    children: Mapping[PurePath, Node]
+    entries: Sequence[_Entry]
+    nodes: Sequence[Node]
+
+
+_LOCK = Lock()
+_ORDERS: MutableMapping[PurePath, _Order] = {}
+
+
+def _suffixx(path: PurePath) -> _Str:
+    if path.suffix:
+        return strxfrm(path.suffix)
+    elif path.stem.startswith(extsep):
+        return strxfrm(path.stem)
+    else:
+        return _EMPTY
+
+
+@lru_cache(maxsize=_INTERN_SIZE)
+def _interned(
+    _: str, sort_by: Tuple[Sortby, ...], name: str, is_dir: bool
+) -> Tuple[Any, ...]:
+    path = PurePath(name)
+
+    def cont() -> Iterator[Any]:
+        for sb in sort_by:
+            if sb is Sortby.is_folder:
+                yield _CompVals.FOLDER if is_dir else _CompVals.FILE
+            elif sb is Sortby.ext:
+                yield "" if is_dir else _suffixx(path)
+            elif sb is Sortby.file_name_lower:
+                yield strxfrm(path.name.casefold())
+            elif sb is Sortby.file_name:
+                yield strxfrm(path.name)
+            elif sb is Sortby.file_name_natural:
+                yield tuple(
+                    int(chunk) if idx % 2 else strxfrm(chunk)
+                    for idx, chunk in enumerate(_DIGITS.split(path.name))
+                )
+            elif sb is Sortby.size or sb is Sortby.mtime:
+                yield 0
+            else:
+                never(sb)
+
+    return tuple(cont())
+
+
+def needs_stats(sort_by: Iterable[Sortby]) -> bool:
+    return not _STATS.isdisjoint(sort_by)
+
+
+def _by_stat(sort_by: Sortby, is_dir: bool, stat: Optional[Stat]) -> int:
+    if not stat:
+        return 0
+    elif sort_by is Sortby.size:
+        return 0 if is_dir else -stat.size
+    else:
+        return -stat.mtime_ns
+
+
+def sort_key(
+    sort_by: Sequence[Sortby],
+    path: PurePath,
+    is_dir: bool,
+    stat: Optional[Stat] = None,
+) -> Tuple[Any, ...]:
+    """
+    Interned per file name & collation locale, `stat` is only read for size & mtime
+    """
+
+    collate = setlocale(LC_COLLATE)
+    key = _interned(collate, tuple(sort_by), name=path.name, is_dir=is_dir)
+    if not needs_stats(sort_by):
+        return key
+    else:
+        return tuple(
+            _by_stat(sb, is_dir=is_dir, stat=stat) if sb in _STATS else val
+            for sb, val in zip(sort_by, key)
+        )
+
+
+def _entry(sort_by: Sequence[Sortby], node: Node) -> _Entry:
+    is_dir = bool(node.mask & _FOLDER)
+    key = sort_key(sort_by, path=node.path, is_dir=is_dir, stat=node.stat)
+    return key, node.path.name, node.path
+
+
+def _reorder(
+    prev: _Order, sort_by: Sequence[Sortby], children: Mapping[PurePath, Node]
+) -> List[_Entry]:
+    prev_children = prev.children
+    stats = needs_stats(sort_by)
+    flipped = {
+        path
+        for path, node in children.items()
+        if (old := prev_children.get(path))
+        and ((old.mask ^ node.mask) & _FOLDER or stats and old.stat != node.stat)
+    }
+    removed = (prev_children.keys() - children.keys()) | flipped
+    added = (children.keys() - prev_children.keys()) | flipped
+
+    if (len(removed) + len(added)) * _REORDER_RATIO > len(children):
+        return sorted(_entry(sort_by, node=node) for node in children.values())
+    else:
+        entries = [*prev.entries]
+        for path in removed:
+            entry = _entry(sort_by, node=prev_children[path])
+            del entries[bisect_left(entries, entry)]
+        for path in added:
+            insort(entries, _entry(sort_by, node=children[path]))
+        return entries
+
+
+def sorted_children(node: Node, sort_by: Sequence[Sortby]) -> Sequence[Node]:
+    """
+    Kept per folder, only re-sorted when its listing changes by a lot
+    """
+
+    children = node.children
+    if not children:
+        return ()
+
+    with _LOCK:
+        prev = _ORDERS.get(node.path)
+    if prev and prev.sort_by == sort_by and prev.children is children:
+        return prev.nodes
+
+    if prev and prev.sort_by == sort_by:
+        entries: Sequence[_Entry] = _reorder(prev, sort_by=sort_by, children=children)
+    else:
+        entries = sorted(_entry(sort_by, node=child) for child in children.values())
+
+    nodes = tuple(map(children.__getitem__, map(itemgetter(2), entries)))
+    order = _Order(sort_by=sort_by, children=children, entries=entries, nodes=nodes)
+    with _LOCK:
+        _ORDERS[node.path] = order
+    return nodes
+
+
+def forget(keep: Iterable[PurePath]) -> None:
+    """
+    Drop orders of folders no longer open
+    """
+
+    with _LOCK:
+        for path in _ORDERS.keys() - {*keep}:
+            _ORDERS.pop(path, None)
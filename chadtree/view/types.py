@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import PurePath
-from typing import Mapping, Optional, Sequence
+from typing import Callable, Mapping, Optional, Sequence, Tuple
 
 from pynvim_pp.highlight import HLgroup
 
-from chad_types import IconGlyphs
+from chad_types import Icon, IconGlyphs
 
 from ..fs.types import Mode, Node
 
@@ -34,17 +34,24 @@ class HLcontext:
     particular_mappings: HLGroups
 
 
+Resolver = Callable[[str, int], Tuple[Icon, Optional[str], Optional[str]]]
+
+
 class Sortby(Enum):
     is_folder = auto()
     ext = auto()
     file_name_lower = auto()
     file_name = auto()
+    file_name_natural = auto()
+    size = auto()
+    mtime = auto()
 
 
 @dataclass(frozen=True)
 class ViewOptions:
     hl_context: HLcontext
     icons: IconGlyphs
+    resolver: Resolver
     sort_by: Sequence[Sortby]
     time_fmt: str
     use_icons: bool